@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the move run loop
+Runs Move.run and simple.main headless against fake idle, lock and input
+backends on a virtual clock, then measures loop overhead, wakeups per
+simulated hour, probe cost, trajectory emission time, indicator update
+cost, multi-session daemon memory per session and startup time.
+Usage: python benchmarks/bench.py [--hours N] [--output FILE] [--baseline FILE]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import move  # noqa: E402
+import simple  # noqa: E402
+import startup  # noqa: E402  (benchmarks/startup.py)
+
+# Metrics where a larger value is a regression; everything else is informational
+CHECKED = ('move_loop_cpu_ms_per_hour', 'move_wakeups_per_hour',
+           'simple_loop_cpu_ms_per_hour', 'simple_wakeups_per_hour',
+           'probe_sample_us', 'trajectory_cycle_us', 'indicator_update_us', 'startup_wall_ms',
+           'daemon_kb_per_session')
+
+
+def scenario(idle, lock, hours):
+    """Per simulated hour: 10 min of typing, 30 min idle, 10 min locked, 10 min idle"""
+    events = []
+    for hour in range(hours):
+        base = hour * 3600
+        events += [(base + t, idle.touch) for t in range(0, 600, 5)]
+        events.append((base + 2400, lambda: lock.set_locked(True)))
+        events.append((base + 3000, lambda: lock.set_locked(False)))
+    return events
+
+
+def install_fakes(scheduler_clock):
+    idle = move.FakeIdleSource(clock=scheduler_clock)
+    lock = move.FakeLockMonitor()
+    backend = move.FakeInputBackend()
+    # Injected movement counts as input, exactly like the real thing
+    backend.listeners.append(lambda x, y: idle.touch())
+    move.set_idle_source(idle)
+    move.set_input_backend(backend)
+    return idle, lock, backend
+
+
+def run_loop(kind, hours):
+    """Run one entry point for ``hours`` of virtual time; return its cost"""
+    scheduler = move.VirtualScheduler(end=hours * 3600)
+    idle, lock, backend = install_fakes(scheduler.clock)
+    scheduler.events = sorted(scenario(idle, lock, hours), key=lambda e: e[0])
+    lock.add_listener(scheduler.wake)
+
+    # Indicators draw on the real terminal or desktop; the fake one keeps the same thread
+    indicators = []
+    open_indicator = move.open_indicator
+
+    def fake_indicator(name='auto'):
+        indicators.append(move.FakeIndicator().start())
+        return indicators[-1]
+
+    move.open_indicator = fake_indicator
+    start_cpu = time.process_time()
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            if kind == 'move':
+                jiggler = move.Move()
+                jiggler.lock_monitor = lock
+                jiggler.scheduler = scheduler
+                jiggler.cycle_time = 0
+                jiggler.run(1, 0, False)
+            else:
+                move.set_lock_monitor(lock)
+                simple.CYCLE_TIME = 0
+                simple.main(['1', '0', '30'], scheduler=scheduler, control=False)
+    finally:
+        move.open_indicator = open_indicator
+    cpu_ms = (time.process_time() - start_cpu) * 1000
+    return {
+        f'{kind}_indicator_updates_per_hour': sum(i.updates for i in indicators) / hours,
+        f'{kind}_loop_cpu_ms_per_hour': cpu_ms / hours,
+        f'{kind}_wakeups_per_hour': scheduler.wakeups / hours,
+        f'{kind}_pointer_events_per_hour': backend.moves / hours,
+    }
+
+
+def per_call_us(fn, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def bench_probes(number):
+    install_fakes(time.monotonic)
+    move.set_lock_monitor(move.FakeLockMonitor())
+    return {
+        'probe_idle_us': per_call_us(move.get_idle_time, number),
+        'probe_sample_us': per_call_us(lambda: move.probes.sample(['lock', 'idle'], 0.5), number),
+    }
+
+
+def bench_indicator(number):
+    """Cost the run loop pays per indicator update (the drawing happens elsewhere)"""
+    indicator = move.FakeIndicator().start()
+    try:
+        return {'indicator_update_us': per_call_us(lambda: indicator.update('move', 1), number)}
+    finally:
+        indicator.close()
+
+
+def bench_trajectories(number):
+    install_fakes(time.monotonic)
+    results = {}
+    for pattern in sorted(move.TRAJECTORIES):
+        offsets = move.trajectory_offsets(pattern, 25, 20)
+        us = per_call_us(lambda: move.emit_trajectory(offsets, 0), number)
+        results[f'trajectory_{pattern}_us'] = us
+    results['trajectory_cycle_us'] = results['trajectory_circle_us']
+    return results
+
+
+def bench_startup(runs):
+    samples = [startup.run_once('fake') for _ in range(runs)]
+    return {
+        'startup_wall_ms': statistics.median(s['wall_ms'] for s in samples),
+        'startup_import_ms': statistics.median(s['import_ms'] for s in samples),
+        'startup_rss_mb': max(s['rss_mb'] for s in samples),
+    }
+
+
+def bench_daemon(count, seconds):
+    """Serve ``count`` fake sessions from one SessionDaemon for ``seconds``"""
+    import asyncio
+    import tracemalloc
+    defaults = dict(interval_minutes=0, interval_seconds=1, circle_radius=25, circle_steps=20,
+                    idle_threshold=0, pattern='circle', cycle_time=0, lock_poll_seconds=10)
+    daemon = move.SessionDaemon()
+
+    async def serve():
+        task = asyncio.get_running_loop().create_task(daemon.run())
+        await asyncio.sleep(seconds)
+        daemon.stop()
+        await task
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        daemon.add(move.open_session({'display': 'fake', 'name': f's{i}'}, defaults))
+    cpu = time.process_time()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        # Measured while running: includes each session's task and pending timer
+        asyncio.run(serve())
+    cpu = time.process_time() - cpu
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # A cycle is the trajectory plus the move back to where the pointer started
+    events_per_cycle = len(move.trajectory_offsets(
+        defaults['pattern'], defaults['circle_radius'], defaults['circle_steps'])) + 1
+    moves = sum(s.input_backend.moves for s in daemon.sessions.values())
+    return {
+        'daemon_sessions': count,
+        'daemon_kb_per_session': (peak - before) / count / 1024,
+        'daemon_moves_per_second': moves / events_per_cycle / seconds,
+        'daemon_cpu_ms_per_session_second': cpu * 1000 / count / seconds,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return ``[(metric, baseline, current)]`` for checked metrics that regressed"""
+    regressions = []
+    for name in CHECKED:
+        old, new = baseline.get(name), results.get(name)
+        if old is None or new is None:
+            continue
+        if new > old * (1 + threshold):
+            regressions.append((name, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the move run loop headless")
+    parser.add_argument('--hours', type=int, default=24, help='Simulated hours per loop run (default: 24)')
+    parser.add_argument('--number', type=int, default=2000, help='Iterations for micro-benchmarks (default: 2000)')
+    parser.add_argument('--startup-runs', type=int, default=5, help='Fresh interpreters for startup (default: 5)')
+    parser.add_argument('--sessions', type=int, default=500,
+                        help='Fake sessions served by the daemon benchmark (default: 500)')
+    parser.add_argument('--output', default=None, help='Write results JSON here')
+    parser.add_argument('--baseline', default=None, help='Results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed relative increase over the baseline (default: 0.25)')
+    args = parser.parse_args()
+
+    results = {}
+    results.update(run_loop('move', args.hours))
+    results.update(run_loop('simple', args.hours))
+    results.update(bench_probes(args.number))
+    results.update(bench_trajectories(args.number))
+    results.update(bench_indicator(args.number))
+    results.update(bench_daemon(args.sessions, 3))
+    results.update(bench_startup(args.startup_runs))
+
+    report = {
+        'time': time.time(),
+        'python': sys.version.split()[0],
+        'platform': move.SYSTEM,
+        'hours': args.hours,
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new in regressions:
+            print(f"REGRESSION {name}: {old:.3f} -> {new:.3f} (+{(new / old - 1) * 100:.0f}%)",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for move.py
+Runs fresh interpreters that import move.py (or simple.py), open the input
+backend and take the first idle reading, then reports cold-start wall time
+and peak RSS.
+Usage: python benchmarks/startup.py [--runs N] [--entry move|simple] [--check]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budgets for a Linux cold start (see README)
+MAX_STARTUP_MS = 50
+MAX_RSS_MB = 15
+
+CHILD = r"""
+import json, resource, sys, time
+t0 = time.perf_counter()
+__import__(sys.argv[2])
+import move
+t1 = time.perf_counter()
+try:
+    move.set_input_backend(move.open_input_backend(sys.argv[1]))
+    backend = move.get_input_backend().name
+except Exception as e:
+    backend = None
+move.get_idle_time()
+t2 = time.perf_counter()
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'import_ms': (t1 - t0) * 1000, 'first_idle_ms': (t2 - t0) * 1000,
+                  'rss_mb': rss_kb / 1024, 'backend': backend,
+                  'pyautogui_loaded': 'pyautogui' in sys.modules,
+                  'modules': len(sys.modules)}))
+"""
+
+
+def run_once(backend, entry='move'):
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', CHILD, backend, entry], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result['wall_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure move.py cold start time and memory")
+    parser.add_argument('--runs', type=int, default=10, help='Number of fresh interpreters (default: 10)')
+    parser.add_argument('--backend', default='auto',
+                        help='Input backend to open in the child (default: auto)')
+    parser.add_argument('--entry', choices=['move', 'simple'], default='move',
+                        help='Entry point module to import (default: move)')
+    parser.add_argument('--check', action='store_true', help='Exit non-zero if a budget is exceeded')
+    args = parser.parse_args()
+
+    runs = [run_once(args.backend, args.entry) for _ in range(args.runs)]
+    summary = {
+        'runs': args.runs,
+        'wall_ms': statistics.median(r['wall_ms'] for r in runs),
+        'import_ms': statistics.median(r['import_ms'] for r in runs),
+        'first_idle_ms': statistics.median(r['first_idle_ms'] for r in runs),
+        'rss_mb': max(r['rss_mb'] for r in runs),
+        'modules': runs[-1]['modules'],
+        'backend': runs[-1]['backend'],
+        'pyautogui_loaded': any(r['pyautogui_loaded'] for r in runs),
+        'budget': {'wall_ms': MAX_STARTUP_MS, 'rss_mb': MAX_RSS_MB},
+    }
+    print(json.dumps(summary, indent=2))
+
+    if args.check and (summary['wall_ms'] > MAX_STARTUP_MS or summary['rss_mb'] > MAX_RSS_MB):
+        print("Startup budget exceeded", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
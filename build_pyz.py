@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Build a self-contained move.pyz
+Packs move.py, simple.py, the move_backends package and vendored pure-Python
+dependencies into a single zipapp. pip only runs here, at build time - never when the tool starts.
+Usage: python build_pyz.py [--output dist/move.pyz] [--vendor PKG ...]
+"""
+
+import argparse
+import compileall
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipapp
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# Pure-Python packages only: zipimport cannot load extension modules
+DEFAULT_VENDOR = ['jeepney>=0.7']
+
+MAIN = '''\
+import sys
+if len(sys.argv) > 1 and sys.argv[1] == 'simple':
+    del sys.argv[1]
+    import simple
+    simple.main()
+else:
+    import move
+    move.main()
+'''
+
+
+def build(output, vendor):
+    with tempfile.TemporaryDirectory() as tmp:
+        staging = Path(tmp)
+        for name in ('move.py', 'simple.py'):
+            shutil.copy2(ROOT / name, staging / name)
+        shutil.copytree(ROOT / 'move_backends', staging / 'move_backends',
+                        ignore=shutil.ignore_patterns('__pycache__'))
+        (staging / '__main__.py').write_text(MAIN)
+
+        if vendor:
+            print(f"Vendoring: {' '.join(vendor)}")
+            subprocess.check_call([sys.executable, '-m', 'pip', 'install', '--quiet',
+                                   '--no-compile', '--target', str(staging)] + vendor)
+        for pattern in ('*.dist-info', 'bin', '*/tests', '*/*/tests'):
+            for path in staging.glob(pattern):
+                shutil.rmtree(path)
+
+        # zipimport only picks up legacy (non-__pycache__) .pyc files; shipping
+        # them saves compiling every module on each cold start. They are
+        # specific to this interpreter version.
+        compileall.compile_dir(str(staging), legacy=True, quiet=1)
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # Stored, not deflated: decompression would cost more at startup than it saves on disk
+        zipapp.create_archive(staging, output, interpreter='/usr/bin/env python3', compressed=False)
+    print(f"Built {output} ({output.stat().st_size // 1024} KB) for Python {sys.version_info[0]}.{sys.version_info[1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a self-contained move.pyz")
+    parser.add_argument('--output', type=Path, default=ROOT / 'dist' / 'move.pyz',
+                        help='Output file (default: dist/move.pyz)')
+    parser.add_argument('--vendor', action='append', default=None, metavar='PKG',
+                        help='Pip requirement to bundle; repeatable (default: jeepney)')
+    parser.add_argument('--no-vendor', action='store_true',
+                        help='Bundle only move.py, simple.py and move_backends')
+    args = parser.parse_args()
+
+    vendor = [] if args.no_vendor else (args.vendor or DEFAULT_VENDOR)
+    build(args.output, vendor)
+
+
+if __name__ == "__main__":
+    main()
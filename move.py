@@ -2,139 +2,2542 @@
 """
 Mouse Jiggler - A cross-platform mouse movement tool
 Moves the mouse in small circular patterns to prevent screen lock/sleep
-Single-file executable version with automatic dependency installation
+Core shared by move.py's command line and simple.py; the backends for each
+OS live in move_backends/ and only the current OS's module is ever imported
 """
 
-import argparse
 import json
 import os
 import sys
 import time
 import math
-import subprocess
-import platform
-from pathlib import Path
+import functools
+import threading
 
-def install_pyautogui():
-    """Install pyautogui if not available"""
+# move_backends modules import this module by name; under `python -m move`
+# it runs as __main__ and must not be executed a second time
+sys.modules.setdefault('move', sys.modules[__name__])
+
+def _detect_system():
+    """platform.system() equivalent without importing platform on common OSes"""
+    known = {'linux': 'Linux', 'darwin': 'Darwin', 'win32': 'Windows'}
+    if sys.platform in known:
+        return known[sys.platform]
+    import platform
+    return platform.system()
+
+
+# Resolved once: the OS never changes under a running process
+SYSTEM = _detect_system()
+
+# Startup is measured from here to the first idle check (see main)
+_STARTED = time.perf_counter()
+STARTUP_BUDGET_MS = 50
+
+# ---------------------------------------------------------------------------
+# Capability cache
+#
+# Probing candidate backends (dlopen, D-Bus connects, device opens) is the
+# slow part of startup. The first run records which backend of each kind
+# worked; later runs try only that one and fall back to a full probe if it
+# stops working. Nothing is ever installed at runtime.
+# ---------------------------------------------------------------------------
+
+CAPABILITY_CACHE_VERSION = 1
+
+
+def _cache_dir():
+    """Per-user cache directory for move"""
+    if SYSTEM == 'Windows':
+        base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'move')
+
+
+class CapabilityCache:
+    """Remembers which backends were usable on this machine"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(_cache_dir(), 'capabilities.json')
+        self._data = None
+        self._dirty = False
+
+    def fingerprint(self):
+        """Cache key: anything that changes which backends can work"""
+        return [CAPABILITY_CACHE_VERSION, SYSTEM, list(sys.version_info[:2]),
+                bool(os.environ.get('DISPLAY')), bool(os.environ.get('WAYLAND_DISPLAY'))]
+
+    def _load(self):
+        if self._data is None:
+            self._data = {}
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if data.get('fingerprint') == self.fingerprint():
+                    self._data = data.get('backends', {})
+            except (OSError, ValueError):
+                pass
+        return self._data
+
+    def cached(self, kind):
+        """Names recorded as working for ``kind`` (empty if unknown)"""
+        return list(self._load().get(kind, []))
+
+    def order(self, kind, candidates):
+        """Return ``candidates`` with the recorded working ones first"""
+        cached = [c for c in self.cached(kind) if c in candidates]
+        return cached + [c for c in candidates if c not in cached]
+
+    def record(self, kind, names):
+        names = list(names)
+        if self._load().get(kind) != names:
+            self._data[kind] = names
+            self._dirty = True
+
+    def clear(self):
+        """Forget everything so the next opens probe from scratch"""
+        self._data = {}
+        self._dirty = True
+
+    def save(self, log=None):
+        """Write the cache if it changed (atomically, via a temp file)
+
+        A failure is reported to ``log`` (the run loop's LoopLog).
+        """
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = os.path.splitext(self.path)[0] + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump({'fingerprint': self.fingerprint(), 'backends': self._data}, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            (log or LoopLog()).warning(f"Could not save capability cache: {e}", event='capabilities')
+
+
+capabilities = CapabilityCache()
+
+
+def _open_first(kind, candidates, factory):
+    """Open the first usable candidate, trying the cached one first"""
+    for candidate in capabilities.order(kind, candidates):
+        try:
+            backend = factory(candidate)
+        except Exception:
+            continue
+        capabilities.record(kind, [candidate])
+        return backend
+    return None
+
+# ---------------------------------------------------------------------------
+# Metrics
+#
+# Counters and latency histograms for the run loop, kept in-process and
+# cheap enough to always collect. They can be scraped as Prometheus text
+# from localhost, flushed periodically to a JSON file, or printed as a
+# per-phase profile on exit.
+# ---------------------------------------------------------------------------
+
+# Seconds; spans microsecond probes up to hour-long sleeps
+HISTOGRAM_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5,
+                     1, 5, 10, 60, 300, 3600)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram"""
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+
+class _Timer:
+    """Context manager observing its own duration into a histogram"""
+
+    def __init__(self, metrics, name, labels):
+        self.metrics, self.name, self.labels = metrics, name, labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        self.metrics.observe(self.name, self.elapsed, **self.labels)
+
+
+def _metric_key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _format_key(name, labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return name
+    return name + '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+
+class Metrics:
+    """Thread-safe counters, gauges and histograms keyed by name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = _metric_key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges[_metric_key(name, labels)] = value
+
+    def observe(self, name, seconds, **labels):
+        key = _metric_key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def timer(self, name, **labels):
+        return _Timer(self, name, labels)
+
+    def render_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines, typed = [], set()
+
+        def header(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f'# TYPE {name} {kind}')
+
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                header(name, 'counter')
+                lines.append(f'{_format_key(name, labels)} {value}')
+            for (name, labels), value in sorted(self.gauges.items()):
+                header(name, 'gauge')
+                lines.append(f'{_format_key(name, labels)} {value}')
+            for (name, labels), h in sorted(self.histograms.items()):
+                header(name, 'histogram')
+                cumulative = 0
+                for bound, count in zip(list(h.buckets) + ['+Inf'], h.counts):
+                    cumulative += count
+                    lines.append(f"{_format_key(name + '_bucket', labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{_format_key(name + '_sum', labels)} {h.sum}")
+                lines.append(f"{_format_key(name + '_count', labels)} {h.count}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        """Plain-dict view for the JSON stats file"""
+        with self._lock:
+            return {
+                'counters': {_format_key(n, l): v for (n, l), v in self.counters.items()},
+                'gauges': {_format_key(n, l): v for (n, l), v in self.gauges.items()},
+                'histograms': {_format_key(n, l): {'count': h.count, 'sum': h.sum,
+                                                   'buckets': dict(zip(map(str, h.buckets), h.counts))}
+                               for (n, l), h in self.histograms.items()},
+            }
+
+    def phase_profile(self):
+        """Return ``[(phase, count, total_s, mean_ms)]`` from move_phase_seconds"""
+        rows = []
+        with self._lock:
+            for (name, labels), h in sorted(self.histograms.items()):
+                if name != 'move_phase_seconds':
+                    continue
+                rows.append((dict(labels).get('phase'), h.count, h.sum,
+                             h.sum / h.count * 1000 if h.count else 0.0))
+        return rows
+
+
+metrics = Metrics()
+
+
+def start_metrics_server(port, host='127.0.0.1'):
+    """Serve ``metrics`` as Prometheus text on http://host:port/metrics"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
+
+
+class StatsFileWriter:
+    """Flushes a JSON stats snapshot to ``path`` every ``interval`` seconds
+
+    Write errors go to ``log`` (the run loop's LoopLog), not straight to stdout.
+    """
+
+    def __init__(self, path, interval=60, extra=None, log=None):
+        self.path = path
+        self.interval = interval
+        self.log = log or LoopLog()
+        # Callables returning more sections for the snapshot ({name: fn})
+        self.extra = extra or {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stats-file', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        data = metrics.snapshot()
+        data['time'] = time.time()
+        for name, fn in self.extra.items():
+            data[name] = fn()
+        try:
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            self.log.warning(f"Could not write stats file: {e}", event='stats')
+
+    def stop(self):
+        self._stop.set()
+        self.flush()
+
+
+# ---------------------------------------------------------------------------
+# Logging
+#
+# The run loop reports every decision, which under launchd, systemd or the
+# Task Scheduler adds up to thousands of near-identical lines a day. LoopLog
+# prints a repeated state once when it starts and a summary when it ends
+# (or every ``summary_interval`` while it lasts). Lines are written by a
+# background thread from a bounded queue, so a slow or blocked stdout pipe
+# drops messages instead of stalling the loop.
+# ---------------------------------------------------------------------------
+
+LOG_QUEUE_SIZE = 1000  # pending lines; more are dropped and counted
+
+
+def _format_duration(seconds):
+    if seconds < 120:
+        return f"{seconds:.0f} s"
+    if seconds < 7200:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+class LoopLog:
+    """Deduplicating, non-blocking log writer for the run loops
+
+    ``state(key, message)`` logs ``message`` only when ``key`` differs from
+    the previous state of the same ``source``; repeats are counted and
+    reported as "<label> for N min (M times)". ``info`` and ``warning``
+    always log. With ``json_lines`` each line is a JSON object with ``ts``,
+    ``level``, ``event`` and ``msg`` plus the extra fields.
+    """
+    summary_interval = 3600  # seconds between summaries of a state that lasts
+
+    def __init__(self, stream=None, json_lines=False, maxsize=LOG_QUEUE_SIZE, clock=time.monotonic):
+        import queue
+        self.stream = stream  # None: sys.stdout when the writer starts
+        self.json_lines = json_lines
+        self.clock = clock
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+        self._full = queue.Full
+        self._states = {}  # source -> [key, label, fields, since, count, reported_at]
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def state(self, key, message, source=None, label=None, **fields):
+        """Log ``message`` if the state of ``source`` changed to ``key``"""
+        now = self.clock()
+        current = self._states.get(source)
+        if current is not None and current[0] == key:
+            current[4] += 1
+            if now - current[5] >= self.summary_interval:
+                self._summarize(source, current, now, ' so far')
+                current[4], current[5] = 0, now
+            return
+        if current is not None and self._worth_summary(current, now):
+            self._summarize(source, current, now)
+        self._states[source] = [key, label or key, fields, now, 1, now]
+        self._put('info', key, message, source, fields)
+
+    @staticmethod
+    def _worth_summary(current, now):
+        # Repeated, or a single check that held for a while (e.g. locked overnight)
+        return current[4] > 1 or now - current[3] >= 600
+
+    def _summarize(self, source, current, now, suffix=''):
+        key, label, fields, since, count = current[:5]
+        seconds = now - since
+        message = f"{label} for {_format_duration(seconds)}{suffix}"
+        if count > 1:
+            message += f" ({count} times)"
+        self._put('info', key, message, source, dict(fields, repeated=count, seconds=round(seconds, 1)))
+
+    def info(self, message, event='info', source=None, **fields):
+        self._put('info', event, message, source, fields)
+
+    def warning(self, message, event='warning', source=None, **fields):
+        self._put('warning', event, message, source, fields)
+
+    def _put(self, level, event, message, source, fields):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait((time.time(), level, event, message, source, fields))
+        except self._full:
+            self.dropped += 1
+            metrics.inc('move_log_dropped_total')
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._stream = self.stream or sys.stdout
+                self._reported_drops = self.dropped
+                self._thread = threading.Thread(target=self._run, name='log', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            if self.dropped != self._reported_drops:
+                lost, self._reported_drops = self.dropped - self._reported_drops, self.dropped
+                self._write((time.time(), 'warning', 'dropped', f"{lost} log messages dropped",
+                             None, {'count': lost}))
+            self._write(record)
+            if self._queue.empty():
+                try:
+                    self._stream.flush()
+                except (OSError, ValueError):
+                    pass
+
+    def _write(self, record):
+        ts, level, event, message, source, fields = record
+        if self.json_lines:
+            entry = {'ts': round(ts, 3), 'level': level, 'event': event, 'msg': message}
+            if source is not None:
+                entry['source'] = source
+            entry.update(fields)
+            line = json.dumps(entry)
+        else:
+            if source is not None:
+                message = f"[{source}] {message}"
+            line = f"Warning: {message}" if level == 'warning' else message
+        try:
+            self._stream.write(line + '\n')
+        except (OSError, ValueError):
+            pass
+
+    def close(self, timeout=2):
+        """Summarize open states and drain the queue (waiting at most ``timeout``)"""
+        now = self.clock()
+        for source, current in list(self._states.items()):
+            if self._worth_summary(current, now):
+                self._summarize(source, current, now)
+        self._states.clear()
+        thread = self._thread
+        if thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except self._full:
+            return  # the writer is stuck on a blocked stream; leave it behind
+        thread.join(timeout)
+        self._thread = None
+
+
+# ---------------------------------------------------------------------------
+# Probes
+#
+# Every platform query the loop makes goes through a Probe: a failing probe
+# backs off instead of paying its cost (or a 5 s subprocess timeout) again
+# on every pass, a probe that keeps failing trips a circuit breaker, and
+# blocking probes run on worker threads so one stalled probe cannot hold up
+# the cycle past its latency budget.
+# ---------------------------------------------------------------------------
+
+class BackendUnavailable(Exception):
+    """Base for errors raised when a backend cannot be used on this machine"""
+
+
+class _ProbeJob:
+    """Result slot for a probe running on a worker thread"""
+
+    def __init__(self, default):
+        self.done = threading.Event()
+        self.value = default
+
+
+class Probe:
+    """A platform query with negative-result back-off and a circuit breaker
+
+    After ``failure_threshold`` consecutive failures the breaker opens and the
+    probe is skipped (returning ``default``) for ``backoff`` seconds, doubling
+    up to ``max_backoff`` while it keeps failing. Errors that cannot fix
+    themselves (a missing executable, an unavailable backend) open it at
+    ``max_backoff`` straight away. ``blocking`` (a bool or a callable) marks
+    probes that may stall and should run on a worker thread.
+    """
+    permanent_errors = (FileNotFoundError, PermissionError, BackendUnavailable)
+
+    def __init__(self, name, fn, default=None, blocking=False, failure_threshold=3,
+                 backoff=5.0, max_backoff=300.0, clock=time.monotonic):
+        self.name = name
+        self.fn = fn
+        self.default = default
+        self._blocking = blocking
+        self.failure_threshold = failure_threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.calls = self.failures = self.skips = self.timeouts = 0
+        self.consecutive_failures = 0
+        self.last_latency = 0.0
+        self.last_error = None
+        self._retry_at = 0.0
+        self._current_backoff = backoff
+        self._inflight = None
+
+    @property
+    def blocking(self):
+        return self._blocking() if callable(self._blocking) else self._blocking
+
+    @property
+    def open(self):
+        """True while the breaker is open and calls are being skipped"""
+        return self.clock() < self._retry_at
+
+    def __call__(self):
+        """Run the probe inline; return ``default`` if it fails or is skipped"""
+        if self.open:
+            self.skips += 1
+            metrics.inc('move_probe_skips_total', probe=self.name)
+            return self.default
+        self.calls += 1
+        start = time.perf_counter()
+        try:
+            value = self.fn()
+        except Exception as e:
+            self.last_latency = time.perf_counter() - start
+            metrics.observe('move_probe_seconds', self.last_latency, probe=self.name)
+            self._failed(e)
+            return self.default
+        self.last_latency = time.perf_counter() - start
+        metrics.observe('move_probe_seconds', self.last_latency, probe=self.name)
+        self.consecutive_failures = 0
+        self._current_backoff = self.backoff
+        return value
+
+    def _failed(self, error):
+        metrics.inc('move_probe_failures_total', probe=self.name)
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = error
+        if isinstance(error, self.permanent_errors):
+            self._current_backoff = self.max_backoff
+        elif self.consecutive_failures < self.failure_threshold:
+            return
+        self._retry_at = self.clock() + self._current_backoff
+        self._current_backoff = min(self._current_backoff * 2, self.max_backoff)
+
+    def submit(self):
+        """Start the probe on a worker thread and return its job
+
+        If the previous run is still stuck, nothing new is started and the
+        returned job already holds ``default``.
+        """
+        job = _ProbeJob(self.default)
+        if self._inflight is not None and not self._inflight.done.is_set():
+            self.skips += 1
+            job.done.set()
+            return job
+        self._inflight = job
+
+        def run():
+            job.value = self()
+            job.done.set()
+
+        threading.Thread(target=run, name=f'probe-{self.name}', daemon=True).start()
+        return job
+
+    def stats(self):
+        return {'calls': self.calls, 'failures': self.failures, 'skips': self.skips,
+                'timeouts': self.timeouts, 'open': self.open,
+                'last_latency_ms': self.last_latency * 1000,
+                'last_error': repr(self.last_error) if self.last_error else None}
+
+
+class ProbeRegistry:
+    """Named probes, sampled together under one latency budget"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._probes = {}
+
+    def register(self, probe):
+        self._probes[probe.name] = probe
+        return probe
+
+    def __getitem__(self, name):
+        return self._probes[name]
+
+    def __contains__(self, name):
+        return name in self._probes
+
+    def sample(self, names, budget):
+        """Run ``names`` concurrently and return ``{name: value}`` within ``budget`` seconds
+
+        Non-blocking probes run inline; blocking ones run on worker threads
+        and any still running at the deadline report their default (and count
+        as a failure) while they finish in the background.
+        """
+        deadline = self.clock() + budget
+        results, pending = {}, {}
+        for name in names:
+            probe = self._probes[name]
+            if probe.blocking:
+                pending[name] = probe.submit()
+            else:
+                results[name] = probe()
+        for name, job in pending.items():
+            if job.done.wait(max(0.0, deadline - self.clock())):
+                results[name] = job.value
+            else:
+                probe = self._probes[name]
+                probe.timeouts += 1
+                metrics.inc('move_probe_timeouts_total', probe=name)
+                probe._failed(TimeoutError(f"{name} exceeded {budget}s budget"))
+                results[name] = probe.default
+        return results
+
+    def stats(self):
+        return {name: probe.stats() for name, probe in self._probes.items()}
+
+
+probes = ProbeRegistry()
+
+
+# ---------------------------------------------------------------------------
+# Platform backends
+#
+# Backends that only work on one OS live in move_backends/<os>.py and
+# register themselves in the registries below when imported. The module for
+# this OS is imported once, the first time a backend is opened or listed;
+# the other platforms' code is never loaded.
+# ---------------------------------------------------------------------------
+
+PLATFORM_MODULES = {
+    'Linux': 'move_backends.linux',
+    'Darwin': 'move_backends.darwin',
+    'Windows': 'move_backends.windows',
+}
+
+
+@functools.lru_cache(maxsize=1)
+def platform_backends():
+    """Import and return this OS's backend module, or None if there is none"""
+    name = PLATFORM_MODULES.get(SYSTEM)
+    if name is None:
+        return None
+    import importlib
+    return importlib.import_module(name)
+
+
+# ---------------------------------------------------------------------------
+# Idle sources
+#
+# Each source answers "how many seconds since the last user input?" from
+# inside this process. Native sources open their display/bus connection once
+# and then cost a single library call or IPC round trip per probe, instead of
+# a fork and exec of xprintidle/ioreg on every loop pass.
+# ---------------------------------------------------------------------------
+
+IDLE_SOURCES = {}
+
+
+def register_idle_source(cls):
+    """Class decorator adding an idle source to the registry"""
+    IDLE_SOURCES[cls.name] = cls
+    return cls
+
+
+class IdleSourceUnavailable(BackendUnavailable):
+    """Raised when an idle source cannot be used on this machine"""
+
+
+class IdleSource:
+    """Base class for idle time backends"""
+    name = 'base'
+    platforms = ()
+    blocking = False  # True if a probe can stall (IPC, subprocess)
+
+    def idle_seconds(self):
+        """Return seconds since last user input"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any native handles"""
+        pass
+
+
+@register_idle_source
+class FakeIdleSource(IdleSource):
+    """Scriptable idle source for tests and simulations
+
+    Idle time grows with ``clock`` from the last ``set_idle``/``touch`` call,
+    just like a real session that nobody is using.
+    """
+    name = 'fake'
+
+    def __init__(self, idle=0.0, clock=time.monotonic):
+        self.clock = clock
+        self.set_idle(idle)
+
+    def set_idle(self, seconds):
+        self._base = float(seconds)
+        self._since = self.clock()
+
+    def touch(self):
+        """Simulate user input"""
+        self.set_idle(0.0)
+
+    def idle_seconds(self):
+        return self._base + (self.clock() - self._since)
+
+
+@register_idle_source
+class CommandIdleSource(IdleSource):
+    """Last resort: fork xprintidle/ioreg for every probe"""
+    name = 'command'
+    platforms = ('Linux', 'Darwin')
+    blocking = True
+
+    def __init__(self):
+        import shutil
+        tool = 'ioreg' if SYSTEM == 'Darwin' else 'xprintidle'
+        if not shutil.which(tool):
+            raise IdleSourceUnavailable(f"{tool} not found")
+
+    def idle_seconds(self):
+        import subprocess
+        if SYSTEM == 'Darwin':
+            result = subprocess.run(['ioreg', '-c', 'IOHIDSystem', '-d', '4', '-k', 'HIDIdleTime'],
+                                    capture_output=True, text=True, timeout=5)
+            for line in result.stdout.split('\n'):
+                if 'HIDIdleTime' in line:
+                    # Extract the value and convert from nanoseconds to seconds
+                    return int(line.split('=')[1].strip().rstrip(';')) / 1000000000
+            raise IdleSourceUnavailable("HIDIdleTime missing from ioreg output")
+        result = subprocess.run(['xprintidle'], capture_output=True, text=True, timeout=5)
+        return int(result.stdout.strip()) / 1000.0
+
+
+class ActivityListener(IdleSource):
+    """Idle source fed by a stream of raw input events
+
+    A background thread blocks on the input stream and records the time of
+    the last activity, so idle_seconds() is a subtraction. After each burst
+    the thread sleeps for ``coalesce`` seconds and then drains everything
+    that piled up in one read, so a 1000 Hz mouse costs about one wakeup a
+    second instead of a thousand. Events injected by this tool are ignored,
+    so jiggling does not reset the idle time it is measuring.
+    """
+    coalesce = 1.0
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.last_activity = clock()
+        self.bursts = 0
+        self._error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        # The pipe lets close() interrupt the blocking wait
+        self._wake_r, self._wake_w = os.pipe()
+        # Everything the thread waits on is in place before it runs, so a
+        # close() during startup cannot be missed
+        self._prepare()
+        self._thread = threading.Thread(target=self._run, name=f'activity-{self.name}', daemon=True)
+        self._thread.start()
+        return self
+
+    def idle_seconds(self):
+        if self._error is not None:
+            raise IdleSourceUnavailable(f"{self.name} listener stopped: {self._error}")
+        return self.clock() - self.last_activity
+
+    def _prepare(self):
+        """Register the wake pipe (``_wake_r``) wherever the thread will wait on it"""
+
+    def _wait_for_input(self):
+        """Block until input arrives; drain it and return True if any counted"""
+        raise NotImplementedError
+
+    def _close_handles(self):
+        pass
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                if self._wait_for_input():
+                    self.last_activity = self.clock()
+                    self.bursts += 1
+                    self._stop.wait(self.coalesce)
+        except Exception as e:
+            # Without a listener idle time would only grow; fail loudly instead
+            self._error = e
+        finally:
+            self._close_handles()
+            os.close(self._wake_r)
+
+    def close(self):
+        if self._thread is None:
+            self._close_handles()
+        elif not self._stop.is_set():
+            self._stop.set()
+            os.write(self._wake_w, b'x')
+            os.close(self._wake_w)
+
+
+# Preferred probe order per platform; the first one that opens wins
+IDLE_SOURCE_ORDER = {
+    'Linux': ['xss', 'xsync', 'mutter', 'freedesktop', 'command'],
+    'Darwin': ['iokit', 'command'],
+    'Windows': ['win32'],
+}
+
+_idle_source = None
+
+
+def open_idle_source(name='auto'):
+    """Open the named idle source, or the first usable one for this platform"""
+    platform_backends()
+    if name != 'auto':
+        if name not in IDLE_SOURCES:
+            raise IdleSourceUnavailable(f"unknown idle source: {name}")
+        return IDLE_SOURCES[name]()
+    source = _open_first('idle', IDLE_SOURCE_ORDER.get(SYSTEM, []),
+                         lambda candidate: IDLE_SOURCES[candidate]())
+    if source is None:
+        raise IdleSourceUnavailable(f"no idle source available on {SYSTEM}")
+    return source
+
+
+def set_idle_source(source):
+    """Install the idle source used by get_idle_time(), closing the old one"""
+    global _idle_source
+    if _idle_source is not None and _idle_source is not source:
+        _idle_source.close()
+    _idle_source = source
+
+
+def _read_idle_source():
+    global _idle_source
+    if _idle_source is None:
+        _idle_source = open_idle_source()
+    return _idle_source.idle_seconds()
+
+
+# Unopened counts as blocking: opening may connect to a bus or probe devices
+probes.register(Probe('idle', _read_idle_source, default=0,
+                      blocking=lambda: _idle_source is None or _idle_source.blocking))
+
+
+def get_idle_time():
+    """Get system idle time in seconds"""
+    return probes['idle']()
+
+# ---------------------------------------------------------------------------
+# Lock monitors
+#
+# A lock monitor runs for the lifetime of the process, subscribes to the
+# platform's lock/unlock notifications and keeps the answer in ``locked``, so
+# the run loop reads a cached boolean instead of probing. Polling is only used
+# when no notification source is available.
+# ---------------------------------------------------------------------------
+
+LOCK_MONITORS = {}
+
+
+def register_lock_monitor(cls):
+    """Class decorator adding a lock monitor to the registry"""
+    LOCK_MONITORS[cls.name] = cls
+    return cls
+
+
+class LockMonitorUnavailable(BackendUnavailable):
+    """Raised when a lock monitor cannot be used on this machine"""
+
+
+class LockMonitor:
+    """Base class for lock state monitors
+
+    Subclasses read the initial state in ``__init__`` (raising
+    LockMonitorUnavailable if they cannot) and push updates from their
+    background thread through ``_set_locked``. If that thread ends without
+    ``stop()`` (say the bus went away) ``failed`` is set and the listeners
+    are called once more, so the run loop can replace the monitor.
+    """
+    name = 'base'
+    platforms = ()
+
+    def __init__(self):
+        self.locked = False
+        self.failed = False
+        self.error = None
+        self.changed = threading.Event()
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_listener(self, callback):
+        """Call ``callback(locked)`` whenever the lock state changes"""
+        self._listeners.append(callback)
+
+    def _set_locked(self, locked):
+        locked = bool(locked)
+        if locked == self.locked:
+            return
+        self.locked = locked
+        self.changed.set()
+        self._notify()
+
+    def _notify(self):
+        for callback in self._listeners:
+            try:
+                callback(self.locked)
+            except Exception:
+                pass
+
+    def start(self):
+        """Start the background watcher thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f'lock-{self.name}', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self._watch()
+        except Exception as e:
+            self.error = e
+        if not self._stop.is_set():
+            self.failed = True
+            self._notify()
+
+    def stop(self):
+        """Stop watching and release resources"""
+        self._stop.set()
+
+    def _watch(self):
+        pass
+
+
+@register_lock_monitor
+class FakeLockMonitor(LockMonitor):
+    """Lock monitor driven by ``set_locked`` for tests and simulations"""
+    name = 'fake'
+
+    def __init__(self, locked=False):
+        super().__init__()
+        self.locked = bool(locked)
+
+    def set_locked(self, locked):
+        self._set_locked(locked)
+
+
+def _poll_screen_locked():
+    """One-shot lock check used by the polling fallback"""
+    if SYSTEM == "Darwin":  # macOS
+        try:
+            return platform_backends().quartz_session_locked()
+        except ImportError:
+            return False
+    elif SYSTEM == "Windows":
+        import ctypes
+        return ctypes.windll.user32.GetForegroundWindow() == 0
+    elif SYSTEM == "Linux":
+        import subprocess
+        # Check if screen saver is active
+        result = subprocess.run(['gnome-screensaver-command', '-q'],
+                                capture_output=True, text=True, timeout=5)
+        if result.returncode == 0:
+            return 'is active' in result.stdout.lower()
+    return False
+
+
+@register_lock_monitor
+class PollingLockMonitor(LockMonitor):
+    """Fallback that re-checks the lock state every ``poll_interval`` seconds"""
+    name = 'poll'
+    platforms = ('Linux', 'Darwin', 'Windows')
+
+    def __init__(self, poll_interval=10, probe=_poll_screen_locked):
+        super().__init__()
+        self.poll_interval = poll_interval
+        # A missing gnome-screensaver-command backs off instead of failing every poll
+        self._probe = probes.register(Probe('lock-poll', probe))
+        self._check()
+
+    def _check(self):
+        locked = self._probe()
+        if locked is not None:
+            self._set_locked(locked)
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self._check()
+
+
+LOCK_MONITOR_ORDER = {
+    'Linux': ['logind', 'gnome-screensaver', 'screensaver', 'poll'],
+    'Darwin': ['darwin', 'poll'],
+    'Windows': ['poll'],
+}
+
+_lock_monitor = None
+
+
+def open_lock_monitor(name='auto', poll_interval=10):
+    """Open and start the named lock monitor, or the first usable one"""
+    def factory(candidate):
+        if candidate == 'poll':
+            return PollingLockMonitor(poll_interval)
+        return LOCK_MONITORS[candidate]()
+
+    platform_backends()
+    if name != 'auto':
+        if name not in LOCK_MONITORS:
+            raise LockMonitorUnavailable(f"unknown lock monitor: {name}")
+        return factory(name).start()
+    monitor = _open_first('lock', LOCK_MONITOR_ORDER.get(SYSTEM, ['poll']), factory)
+    return (monitor or PollingLockMonitor(poll_interval)).start()
+
+
+def set_lock_monitor(monitor):
+    """Install the lock monitor used by is_screen_locked(), stopping the old one"""
+    global _lock_monitor
+    if _lock_monitor is not None and _lock_monitor is not monitor:
+        _lock_monitor.stop()
+    _lock_monitor = monitor
+
+
+def get_lock_monitor():
+    """Return the process-wide lock monitor, starting one on first use"""
+    global _lock_monitor
+    if _lock_monitor is None:
+        _lock_monitor = open_lock_monitor()
+    return _lock_monitor
+
+
+def is_screen_locked():
+    """Check if screen is locked"""
+    return get_lock_monitor().locked
+
+
+# Reading the monitor's cached flag never blocks
+probes.register(Probe('lock', is_screen_locked, default=False))
+
+# ---------------------------------------------------------------------------
+# Inhibitors
+#
+# The "inhibit" engine keeps the session awake by holding a power/idle
+# inhibitor instead of synthesizing pointer input. Once acquired it costs
+# nothing per cycle: no compositor work, no redraws, no cursor warps.
+# ---------------------------------------------------------------------------
+
+INHIBITORS = {}
+
+
+def register_inhibitor(cls):
+    """Class decorator adding an inhibitor to the registry"""
+    INHIBITORS[cls.name] = cls
+    return cls
+
+
+class InhibitorUnavailable(BackendUnavailable):
+    """Raised when an inhibitor cannot be used on this machine"""
+
+
+class Inhibitor:
+    """Base class for sleep/idle inhibitors"""
+    name = 'base'
+    platforms = ()
+    reason = 'Move is keeping the session awake'
+
+    def __init__(self):
+        self.held = False
+
+    def acquire(self):
+        """Take the inhibitor; no-op if already held"""
+        if not self.held:
+            self._acquire()
+            self.held = True
+
+    def release(self):
+        """Drop the inhibitor; no-op if not held"""
+        if self.held:
+            self.held = False
+            self._release()
+
+    def close(self):
+        self.release()
+
+    def _acquire(self):
+        raise NotImplementedError
+
+    def _release(self):
+        raise NotImplementedError
+
+
+@register_inhibitor
+class FakeInhibitor(Inhibitor):
+    """Inhibitor that only records how often it was taken"""
+    name = 'fake'
+
+    def __init__(self):
+        super().__init__()
+        self.acquired = 0
+
+    def _acquire(self):
+        self.acquired += 1
+
+    def _release(self):
+        pass
+
+
+class InhibitorGroup(Inhibitor):
+    """Holds several inhibitors as one (logind idle + ScreenSaver, for instance)"""
+    name = 'group'
+
+    def __init__(self, inhibitors):
+        super().__init__()
+        self.inhibitors = inhibitors
+        self.name = '+'.join(i.name for i in inhibitors)
+
+    def _acquire(self):
+        # A member that fails (no ScreenSaver service on this desktop, say) is
+        # dropped; the others stay held. Only if none works does this raise.
+        error = None
+        for inhibitor in list(self.inhibitors):
+            try:
+                inhibitor.acquire()
+            except Exception as e:
+                error = e
+                self.inhibitors.remove(inhibitor)
+                try:
+                    inhibitor.close()
+                except Exception:
+                    pass
+        self.name = '+'.join(i.name for i in self.inhibitors)
+        if not self.inhibitors:
+            raise error
+
+    def _release(self):
+        for inhibitor in self.inhibitors:
+            inhibitor.release()
+
+    def close(self):
+        for inhibitor in self.inhibitors:
+            inhibitor.close()
+
+
+# Linux takes every inhibitor that works: desktops differ in which one
+# they honour for blanking. Elsewhere the first usable one wins.
+INHIBITOR_ORDER = {
+    'Linux': ['logind', 'screensaver'],
+    'Darwin': ['iopm', 'caffeinate'],
+    'Windows': ['win32'],
+}
+
+
+def open_inhibitor(name='auto'):
+    """Open the named inhibitor, or the platform's best; None if none is usable"""
+    platform_backends()
+    if name != 'auto':
+        return INHIBITORS[name]()
+    def probe(candidates):
+        found = []
+        for candidate in candidates:
+            try:
+                found.append(INHIBITORS[candidate]())
+            except Exception:
+                continue
+            if SYSTEM != 'Linux':
+                break
+        return found
+
+    # Only re-probe the full list when the recorded set no longer works
+    found = probe(capabilities.cached('inhibit')) or probe(INHIBITOR_ORDER.get(SYSTEM, []))
+    if not found:
+        return None
+    capabilities.record('inhibit', [i.name for i in found])
+    return found[0] if len(found) == 1 else InhibitorGroup(found)
+
+
+# ---------------------------------------------------------------------------
+# Input backends
+#
+# Pointer movement goes through a small backend interface. The native
+# backends talk to the platform with ctypes (or a raw uinput device) so the
+# resident process never has to import pyautogui and the pymsgbox,
+# pytweening, pyscreeze and Pillow stack behind it; pyautogui is only the
+# last fallback.
+# ---------------------------------------------------------------------------
+
+INPUT_BACKENDS = {}
+
+
+def register_input_backend(cls):
+    """Class decorator adding an input backend to the registry"""
+    INPUT_BACKENDS[cls.name] = cls
+    return cls
+
+
+class InputBackendUnavailable(BackendUnavailable):
+    """Raised when an input backend cannot be used on this machine"""
+
+
+class FailSafeException(Exception):
+    """Raised when the pointer sits in a screen corner (the fail-safe gesture)"""
+
+
+class InputBackend:
+    """Base class for pointer injection backends"""
+    name = 'base'
+    platforms = ()
+    failsafe = True
+
+    def position(self):
+        """Return the pointer position; backends that cannot read it back
+        return the position they last moved to"""
+        raise NotImplementedError
+
+    def screen_size(self):
+        """Return ``(width, height)`` of the area starting at screen_origin()"""
+        raise NotImplementedError
+
+    def screen_origin(self):
+        """Top-left corner of the screen area; negative when a monitor sits
+        left of or above the primary one"""
+        return 0, 0
+
+    def move_to(self, x, y):
+        """Move the pointer with a single injected motion event"""
+        if self.failsafe:
+            self._check_failsafe()
+        self._move_to(int(x), int(y))
+
+    def _move_to(self, x, y):
+        raise NotImplementedError
+
+    def _check_failsafe(self):
+        pos = self.position()
+        left, top = self.screen_origin()
+        width, height = self.screen_size()
+        if pos[0] in (left, left + width - 1) and pos[1] in (top, top + height - 1):
+            raise FailSafeException("pointer moved to a screen corner")
+
+    def close(self):
+        pass
+
+
+@register_input_backend
+class FakeInputBackend(InputBackend):
+    """Records moves instead of injecting them (tests, benchmarks, simulations)"""
+    name = 'fake'
+
+    def __init__(self, position=(100, 100), size=(1920, 1080)):
+        self._position = tuple(position)
+        self._size = tuple(size)
+        self.moves = 0
+        self.listeners = []
+
+    def position(self):
+        return self._position
+
+    def screen_size(self):
+        return self._size
+
+    def _move_to(self, x, y):
+        self._position = (x, y)
+        self.moves += 1
+        for callback in self.listeners:
+            callback(x, y)
+
+
+@register_input_backend
+class PyAutoGUIInputBackend(InputBackend):
+    """Fallback through pyautogui, imported only when this backend is chosen"""
+    name = 'pyautogui'
+    platforms = ('Linux', 'Darwin', 'Windows')
+
+    def __init__(self):
+        try:
+            import pyautogui
+        except ImportError:
+            raise InputBackendUnavailable("pyautogui is not installed (pip install pyautogui)")
+        except Exception as e:
+            # pyautogui raises all sorts of errors without a usable display
+            raise InputBackendUnavailable(f"pyautogui: {e}")
+        self._pyautogui = pyautogui
+        # Our own corner check replaces pyautogui's
+        self._pyautogui.FAILSAFE = False
+
+    def position(self):
+        return tuple(self._pyautogui.position())
+
+    def screen_size(self):
+        return tuple(self._pyautogui.size())
+
+    def _move_to(self, x, y):
+        self._pyautogui.moveTo(x, y, _pause=False)
+
+
+INPUT_BACKEND_ORDER = {
+    'Linux': ['xtest', 'uinput', 'pyautogui'],
+    'Darwin': ['cgevent', 'pyautogui'],
+    'Windows': ['sendinput', 'pyautogui'],
+}
+
+_input_backend = None
+
+
+def open_input_backend(name='auto'):
+    """Open the named input backend, or the first usable one for this platform"""
+    platform_backends()
+    if name != 'auto':
+        if name not in INPUT_BACKENDS:
+            raise InputBackendUnavailable(f"unknown input backend: {name}")
+        return INPUT_BACKENDS[name]()
+    backend = _open_first('input', INPUT_BACKEND_ORDER.get(SYSTEM, ['pyautogui']),
+                          lambda candidate: INPUT_BACKENDS[candidate]())
+    if backend is None:
+        raise InputBackendUnavailable(f"no input backend available on {SYSTEM}")
+    return backend
+
+
+def set_input_backend(backend):
+    """Install the input backend used for movement, closing the old one"""
+    global _input_backend
+    if _input_backend is not None and _input_backend is not backend:
+        _input_backend.close()
+    _input_backend = backend
+
+
+def get_input_backend():
+    """Return the process-wide input backend, opening one on first use"""
+    global _input_backend
+    if _input_backend is None:
+        _input_backend = open_input_backend()
+    return _input_backend
+
+
+# ---------------------------------------------------------------------------
+# Trajectories
+#
+# A pattern maps the angle ``t`` in [0, 2*pi) to a pixel offset from the
+# start position. Offset tables are computed once per (pattern, radius,
+# steps) and cached, so a movement cycle is only table lookups plus one
+# untweened move call per step.
+# ---------------------------------------------------------------------------
+
+TRAJECTORIES = {}
+
+
+def register_trajectory(name, steps=None):
+    """Decorator registering ``fn(t, radius, xp) -> (x, y)`` as a pattern
+
+    ``xp`` is either NumPy (``t`` is an array) or ``math`` (``t`` is a
+    float), so one formula serves both paths. ``steps`` pins the number of
+    points regardless of the configured step count.
+    """
+    def decorator(fn):
+        fn.fixed_steps = steps
+        TRAJECTORIES[name] = fn
+        return fn
+    return decorator
+
+
+@register_trajectory('circle')
+def _circle(t, radius, xp):
+    return radius * xp.cos(t), radius * xp.sin(t)
+
+
+@register_trajectory('lissajous')
+def _lissajous(t, radius, xp):
+    # 3:2 figure, phase-shifted to start at (radius, 0) like the circle
+    return radius * xp.sin(3 * t + math.pi / 2), radius * xp.sin(2 * t)
+
+
+@register_trajectory('nudge', steps=1)
+def _nudge(t, radius, xp):
+    # Smallest movement that still counts as input: 1 px right, then back
+    return t * 0 + 1, t * 0
+
+
+# NumPy only pays for itself on large tables; importing it for a 20-point
+# circle would cost more than computing the circle
+NUMPY_MIN_STEPS = 512
+
+
+def _numpy_for(steps):
+    """Return NumPy if it is already loaded or worth importing for ``steps``"""
+    np = sys.modules.get('numpy')
+    if np is None and steps >= NUMPY_MIN_STEPS:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    return np
+
+
+@functools.lru_cache(maxsize=32)
+def trajectory_offsets(pattern, radius, steps):
+    """Return the cached ``((dx, dy), ...)`` offset table for a pattern"""
+    fn = TRAJECTORIES[pattern]
+    steps = max(1, fn.fixed_steps or steps)
+    np = _numpy_for(steps)
+    if np is not None:
+        xs, ys = fn(np.arange(steps) * (2 * math.pi / steps), radius, np)
+        return tuple(zip(np.trunc(xs).astype(int).tolist(), np.trunc(ys).astype(int).tolist()))
+    offsets = []
+    for i in range(steps):
+        x, y = fn(2 * math.pi * i / steps, radius, math)
+        offsets.append((int(x), int(y)))
+    return tuple(offsets)
+
+
+def emit_trajectory(offsets, cycle_time, keep_going=lambda: True):
+    """Walk the pointer through ``offsets`` and back within ``cycle_time`` seconds
+
+    Each step is one untweened move; steps are paced against the monotonic
+    clock so the whole path, including the return, fits the budget. Returns
+    False if ``keep_going()`` cut the path short.
+    """
+    backend = get_input_backend()
+    start_x, start_y = backend.position()
+    step_time = cycle_time / (len(offsets) + 1)
+    deadline = time.monotonic()
+    try:
+        for dx, dy in offsets:
+            if not keep_going():
+                return False
+            backend.move_to(start_x + dx, start_y + dy)
+            deadline += step_time
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+    finally:
+        # Return to original position
+        backend.move_to(start_x, start_y)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Activity indicators
+#
+# Show what the loop is doing without injecting any input: the pointer only
+# ever moves along a trajectory, which ends where it started. The loop hands
+# each state change to update(), which stores it and returns; a background
+# thread draws it, so a slow notification daemon or tray never delays a move.
+# ---------------------------------------------------------------------------
+
+INDICATORS = {}
+
+# Text shown for each state passed to Indicator.update()
+INDICATOR_STATES = {
+    'move': 'keeping the screen awake',
+    'active': 'you are active',
+    'locked': 'screen locked',
+    'paused': 'paused',
+}
+
+
+def register_indicator(cls):
+    """Class decorator adding an activity indicator to the registry"""
+    INDICATORS[cls.name] = cls
+    return cls
+
+
+class IndicatorUnavailable(BackendUnavailable):
+    """Raised when an activity indicator cannot be used on this machine"""
+
+
+class Indicator:
+    """Base class for activity indicators
+
+    ``update(state, moves)`` is called from the run loop and never blocks;
+    subclasses implement ``show(state, moves)``, which runs on the
+    indicator thread with the latest state only, and ``_close()``.
+    """
+    name = 'base'
+
+    def __init__(self):
+        self.moves = 0
+        self._state = None
+        self._changed = threading.Event()
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name=f'indicator-{self.name}', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def update(self, state, moves=0):
+        self.moves = moves
+        self._state = (state, moves)
+        self._changed.set()
+
+    def text(self, state, moves):
+        text = f"Move: {INDICATOR_STATES[state]}"
+        if not moves:
+            return text
+        return f"{text} ({moves} move{'s' if moves != 1 else ''})"
+
+    def show(self, state, moves):
+        raise NotImplementedError
+
+    def _run(self):
+        shown = None
+        while True:
+            self._changed.wait()
+            self._changed.clear()
+            state = self._state
+            if state is not None and state != shown:
+                shown = state
+                try:
+                    self.show(*state)
+                except Exception:
+                    # A broken indicator must never take the loop down with it
+                    pass
+            if self._closing:
+                return
+
+    def close(self, timeout=2):
+        """Show the last state, then stop the thread and clean up"""
+        self._closing = True
+        self._changed.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        self._close()
+
+    def _close(self):
+        pass
+
+
+@register_indicator
+class NullIndicator(Indicator):
+    """Shows nothing and starts no thread"""
+    name = 'none'
+
+    def start(self):
+        return self
+
+    def update(self, state, moves=0):
+        pass
+
+    def close(self, timeout=2):
+        pass
+
+
+@register_indicator
+class FakeIndicator(Indicator):
+    """Records the states it was asked to show and counts update() calls"""
+    name = 'fake'
+
+    def __init__(self):
+        super().__init__()
+        self.shown = []
+        self.updates = 0
+
+    def update(self, state, moves=0):
+        self.updates += 1
+        super().update(state, moves)
+
+    def show(self, state, moves):
+        self.shown.append((state, moves))
+
+
+@register_indicator
+class TerminalIndicator(Indicator):
+    """Spinner and state in the terminal's title bar
+
+    The title, unlike a status line, cannot be torn by log output; the
+    previous title is pushed on start and popped on close.
+    """
+    name = 'terminal'
+    SPINNER = '|/-\\'
+
+    def __init__(self, stream=None):
+        self.stream = sys.stderr if stream is None else stream
+        if not self.stream.isatty():
+            raise IndicatorUnavailable("not a terminal")
+        super().__init__()
+        self._write('\x1b[22;0t')
+
+    def _write(self, text):
+        self.stream.write(text)
+        self.stream.flush()
+
+    def show(self, state, moves):
+        spinner = self.SPINNER[moves % len(self.SPINNER)] if state == 'move' else '.'
+        self._write(f"\x1b]0;{spinner} {self.text(state, moves)}\x07")
+
+    def _close(self):
+        self._write('\x1b[23;0t')
+
+
+class NotificationIndicator(Indicator):
+    """Base class for desktop notifications
+
+    Only a change of state pops up a notification; repeated moves do not.
+    Subclasses implement ``notify(title, text)``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._notified = None
+
+    def show(self, state, moves):
+        if state != self._notified:
+            self._notified = state
+            self.notify('Move', INDICATOR_STATES[state].capitalize())
+
+    def notify(self, title, text):
+        raise NotImplementedError
+
+
+@register_indicator
+class TrayIndicator(Indicator):
+    """Status icon through pystray, imported only when this indicator is chosen
+
+    The icon's colour tells the state and its tooltip carries the text.
+    Opt-in only: on macOS pystray wants the main thread, which the loop owns.
+    """
+    name = 'tray'
+    COLOURS = {'move': (46, 160, 67), 'active': (128, 128, 128),
+               'locked': (48, 48, 48), 'paused': (210, 153, 34)}
+
+    def __init__(self):
+        try:
+            import pystray
+            from PIL import Image, ImageDraw
+        except ImportError:
+            raise IndicatorUnavailable("pystray and Pillow are not installed (pip install pystray pillow)")
+        except Exception as e:
+            # pystray picks its backend on import and fails without a display
+            raise IndicatorUnavailable(f"pystray: {e}")
+        super().__init__()
+        self._image, self._draw = Image, ImageDraw
+        try:
+            self._icon = pystray.Icon('move', self._render('active'), 'Move')
+            self._icon.run_detached()
+        except Exception as e:
+            raise IndicatorUnavailable(f"pystray: {e}")
+
+    def _render(self, state):
+        image = self._image.new('RGBA', (64, 64), (0, 0, 0, 0))
+        self._draw.Draw(image).ellipse((8, 8, 56, 56), fill=self.COLOURS[state])
+        return image
+
+    def show(self, state, moves):
+        self._icon.icon = self._render(state)
+        self._icon.title = self.text(state, moves)
+
+    def _close(self):
+        self._icon.stop()
+
+
+# Tried in order by 'auto'. The tray (pystray and Pillow cost ~7 MB and
+# ~35 ms at startup) and notifications are opt-in
+INDICATOR_ORDER = {
+    'Linux': ['terminal'],
+    'Darwin': ['terminal'],
+    'Windows': ['terminal'],
+}
+
+
+def open_indicator(name='auto'):
+    """Open and start the named indicator, or the platform's best; 'none' if none is usable"""
+    platform_backends()
+    if name != 'auto':
+        if name not in INDICATORS:
+            raise IndicatorUnavailable(f"unknown indicator: {name}")
+        return INDICATORS[name]().start()
+    indicator = _open_first('indicator', INDICATOR_ORDER.get(SYSTEM, ['terminal']),
+                            lambda candidate: INDICATORS[candidate]())
+    return (indicator or NullIndicator()).start()
+
+# ---------------------------------------------------------------------------
+# Scheduling
+# ---------------------------------------------------------------------------
+
+class Scheduler:
+    """Sleeps until the next deadline on a monotonic clock
+
+    ``wake()`` (usable directly as a lock monitor listener) cuts the current
+    sleep short so the run loop can re-evaluate after lock/unlock or
+    settings events instead of waiting out a fixed period.
+    """
+    # Floor on a single sleep so rounding in the idle math cannot busy-loop
+    min_sleep = 0.05
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.wakeups = 0
+        self._event = threading.Event()
+
+    def wake(self, *args):
+        """Interrupt the current (or next) sleep"""
+        self._event.set()
+
+    def sleep_until(self, deadline):
+        """Block until ``deadline`` (None waits for wake()); return True if woken early"""
+        timeout = None if deadline is None else max(self.min_sleep, deadline - self.clock())
+        with metrics.timer('move_phase_seconds', phase='sleep'):
+            woken = self._event.wait(timeout)
+        self._event.clear()
+        self.wakeups += 1
+        metrics.inc('move_wakeups_total', reason='event' if woken else 'deadline')
+        return woken
+
+
+class SimulationEnded(KeyboardInterrupt):
+    """Raised by VirtualScheduler at the end of simulated time
+
+    Subclasses KeyboardInterrupt so run loops take their normal stop path.
+    """
+
+
+class VirtualScheduler(Scheduler):
+    """Scheduler on a virtual clock: sleeping just advances time
+
+    ``events`` is a list of ``(time, callback)`` applied in order as virtual
+    time passes them; a callback that calls ``wake()`` (a lock change, for
+    instance) ends the current sleep at that moment. Reaching ``end``
+    raises SimulationEnded.
+    """
+
+    def __init__(self, start=0.0, end=float('inf'), events=()):
+        super().__init__(clock=lambda: self.now)
+        self.now = start
+        self.end = end
+        self.events = sorted(events, key=lambda e: e[0])
+        self._next_event = 0
+        self._woken = False
+
+    def wake(self, *args):
+        self._woken = True
+
+    def advance(self, until):
+        """Move time forward to ``until``, firing events; stop early if woken"""
+        while self._next_event < len(self.events) and self.events[self._next_event][0] <= until:
+            at, callback = self.events[self._next_event]
+            self._next_event += 1
+            self.now = max(self.now, at)
+            callback()
+            if self._woken:
+                # Events due at this same instant still apply before the loop looks
+                until = self.now
+        if self._woken:
+            return True
+        self.now = max(self.now, until)
+        return False
+
+    def sleep_until(self, deadline):
+        if deadline is not None:
+            deadline = max(deadline, self.now + self.min_sleep)
+        target = self.end if deadline is None else min(deadline, self.end)
+        woken = self._woken or self.advance(target)
+        self._woken = False
+        self.wakeups += 1
+        metrics.inc('move_wakeups_total', reason='event' if woken else 'deadline')
+        if not woken and self.now >= self.end:
+            raise SimulationEnded()
+        return woken
+
+
+# ---------------------------------------------------------------------------
+# Power policy
+#
+# On battery the loop trades punctuality for fewer wakeups: deadlines snap
+# to a coarse grid on the shared monotonic clock so they batch with other
+# timers, the OS may coalesce the loop thread's timers, lock polling slows
+# down and movements shrink to the shortest path that still counts as input.
+# ---------------------------------------------------------------------------
+
+# OS timer slack while saving power: enough to batch wakeups, short enough
+# that the few sleeps inside a movement stay crisp
+TIMER_SLACK_BATTERY = 0.05
+
+
+def _read_on_battery():
+    """True on battery, False on AC (or without a battery), None if unknown"""
+    backends = platform_backends()
+    return backends.on_battery() if backends is not None else None
+
+
+# A machine without /sys/class/power_supply fails with FileNotFoundError, which
+# opens the breaker at max_backoff: one retry every five minutes, not every refresh
+probes.register(Probe('power', _read_on_battery, default=None))
+
+
+def set_timer_coalescing(enabled):
+    """Let the OS batch the calling thread's (Windows: process's) timer wakeups"""
+    backends = platform_backends()
+    if backends is None:
+        return False
+    try:
+        backends.set_timer_coalescing(enabled, TIMER_SLACK_BATTERY)
+    except (OSError, AttributeError):
+        return False
+    return True
+
+
+class PowerPolicy:
+    """Adapts the run loop to the power source
+
+    ``mode`` is 'auto' (save power on battery) or 'off'. While saving,
+    deadlines are rounded up to a ``slack``-second grid, the OS coalesces
+    the loop thread's timers, lock polling is ``poll_scale`` times slower
+    and movements use ``pattern`` with a single step.
+    """
+    refresh = 60  # seconds between power source reads
+    poll_scale = 3
+
+    def __init__(self, mode='auto', slack=5.0, pattern='nudge', clock=time.monotonic,
+                 read=lambda: probes['power']()):
+        self.mode = mode
+        self.slack = slack
+        self.pattern = pattern
+        self.clock = clock
+        self.read = read
+        self.os_hints = True  # False keeps simulations from touching the real thread
+        self.on_battery = None
+        self._checked_at = None
+
+    @property
+    def saving(self):
+        return self.mode == 'auto' and self.on_battery is True
+
+    def invalidate(self):
+        """Re-read the power source on the next update()"""
+        self._checked_at = None
+
+    def update(self):
+        """Re-read the power source when due; return True if ``saving`` changed"""
+        now = self.clock()
+        if self._checked_at is not None and now - self._checked_at < self.refresh:
+            return False
+        self._checked_at = now
+        was_saving = self.saving
+        self.on_battery = self.read()
+        metrics.set('move_on_battery', 1 if self.on_battery else 0)
+        metrics.set('move_power_saving', 1 if self.saving else 0)
+        if self.saving == was_saving:
+            return False
+        if self.os_hints:
+            set_timer_coalescing(self.saving)
+        return True
+
+    def coalesce(self, deadline):
+        """Round ``deadline`` up to the slack grid while saving power"""
+        if deadline is None or not self.saving or self.slack <= 0:
+            return deadline
+        return math.ceil(deadline / self.slack) * self.slack
+
+    def movement(self, pattern, steps, cycle_time):
+        """Return the ``(pattern, steps, cycle_time)`` to move with right now"""
+        if not self.saving:
+            return pattern, steps, cycle_time
+        return self.pattern, 1, min(cycle_time, 0.1)
+
+    def describe(self):
+        source = {True: 'battery', False: 'ac', None: 'unknown'}[self.on_battery]
+        return f"{source}, saving" if self.saving else source
+
+
+# ---------------------------------------------------------------------------
+# Control socket
+#
+# The first instance listens on a per-user Unix domain socket (a named pipe
+# on Windows). Launching the tool again sends one JSON request to it and
+# exits within milliseconds instead of starting a second loop that would
+# fight the first over the pointer.
+# ---------------------------------------------------------------------------
+
+class ControlError(Exception):
+    """Raised when no instance answers, or another one already listens"""
+
+
+def control_address():
+    """Per-user control endpoint: a socket path, or a pipe name on Windows"""
+    if SYSTEM == 'Windows':
+        return r'\\.\pipe\move-' + os.environ.get('USERNAME', 'user')
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    return os.path.join(runtime or _cache_dir(), 'move.sock')
+
+
+def control_request(request, address=None, timeout=2.0):
+    """Send ``request`` to the running instance and return its reply dict"""
+    address = address or control_address()
+    data = json.dumps(request).encode()
     try:
-        import pyautogui
-        return pyautogui
-    except ImportError:
-        print("Installing pyautogui...")
+        if SYSTEM == 'Windows':
+            from multiprocessing.connection import Client
+            with Client(address, family='AF_PIPE') as conn:
+                conn.send_bytes(data)
+                reply = conn.recv_bytes()
+        else:
+            import socket
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                sock.connect(address)
+                sock.sendall(data + b'\n')
+                with sock.makefile('rb') as f:
+                    reply = f.readline()
+        return json.loads(reply)
+    except (OSError, EOFError, ValueError) as e:
+        raise ControlError(f"no instance on {address}: {e}")
+
+
+class ControlServer:
+    """Answers control requests from a background thread
+
+    ``handler(request) -> dict`` runs on the control thread, so it should
+    only flip attributes and wake the scheduler. Exceptions become
+    ``{'ok': False, 'error': ...}`` replies.
+    """
+
+    def __init__(self, handler, address=None):
+        self.handler = handler
+        self.address = address or control_address()
+        self._listener = None
+        self._lock_fd = None
+        # Held while a request is answered so close() lets the reply go out
+        self._busy = threading.Lock()
+
+    def _claim(self):
+        """Take the lock file next to the socket; the kernel drops it when we exit"""
+        import fcntl
+        fd = os.open(self.address + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
         try:
-            # Try normal install first
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "pyautogui"])
-            import pyautogui
-            print("pyautogui installed successfully!")
-            return pyautogui
-        except subprocess.CalledProcessError:
-            print("Trying with --break-system-packages flag...")
-            try:
-                # Try with --break-system-packages flag for externally-managed environments
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "--break-system-packages", "pyautogui"])
-                import pyautogui
-                print("pyautogui installed successfully!")
-                return pyautogui
-            except subprocess.CalledProcessError:
-                print("Error: Could not install pyautogui automatically.")
-                print("Please run: pip3 install --break-system-packages pyautogui")
-                print("Or use a virtual environment: python3 -m venv ~/moveit-env && source ~/moveit-env/bin/activate && pip install pyautogui")
-                sys.exit(1)
-
-# Install and import pyautogui
-pyautogui = install_pyautogui()
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            raise ControlError(f"another instance is listening on {self.address}")
+        self._lock_fd = fd
 
-def get_idle_time():
-    """Get system idle time in seconds"""
-    try:
-        if platform.system() == "Darwin":  # macOS
-            result = subprocess.run(['ioreg', '-c', 'IOHIDSystem'], 
-                                  capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'HIDIdleTime' in line:
-                        # Extract the value and convert from nanoseconds to seconds
-                        idle_ns = int(line.split('=')[1].strip().rstrip(';'))
-                        return idle_ns / 1000000000  # Convert nanoseconds to seconds
-        elif platform.system() == "Windows":
-            import ctypes
-            from ctypes import wintypes
-            kernel32 = ctypes.windll.kernel32
-            last_input = wintypes.DWORD()
-            kernel32.GetLastInputInfo(ctypes.byref(last_input))
-            return (kernel32.GetTickCount() - last_input.value) / 1000.0
-        elif platform.system() == "Linux":
-            # Try to get idle time from X11
+    def start(self):
+        """Claim the control address, or raise ControlError if an instance owns it"""
+        if SYSTEM == 'Windows':
+            from multiprocessing.connection import Listener
+            try:
+                # The first pipe instance is exclusive, so creating it is the claim
+                self._listener = Listener(self.address, family='AF_PIPE')
+            except OSError:
+                raise ControlError(f"another instance is listening on {self.address}")
+            serve = self._serve_pipe
+        else:
+            import socket
+            os.makedirs(os.path.dirname(self.address), exist_ok=True)
+            self._claim()
             try:
-                result = subprocess.run(['xprintidle'], capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    return int(result.stdout.strip()) / 1000.0
+                # We hold the lock, so any socket file left behind is stale
+                os.unlink(self.address)
             except FileNotFoundError:
                 pass
-    except Exception:
-        pass
-    return 0
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            old_umask = os.umask(0o177)  # owner-only socket
+            try:
+                sock.bind(self.address)
+            except OSError as e:
+                sock.close()
+                self._release()
+                raise ControlError(f"cannot listen on {self.address}: {e}")
+            finally:
+                os.umask(old_umask)
+            sock.listen(8)
+            self._listener = sock
+            serve = self._serve_socket
+        threading.Thread(target=serve, name='control', daemon=True).start()
+        return self
 
-def is_screen_locked():
-    """Check if screen is locked"""
-    try:
-        if platform.system() == "Darwin":  # macOS
-            result = subprocess.run(['python3', '-c', 
-                'import Quartz; print(Quartz.CGSessionCopyCurrentDictionary() is None)'], 
-                capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                return result.stdout.strip() == 'True'
-        elif platform.system() == "Windows":
-            import ctypes
-            from ctypes import wintypes
-            user32 = ctypes.windll.user32
-            return user32.GetForegroundWindow() == 0
-        elif platform.system() == "Linux":
-            # Check if screen saver is active
+    def _reply(self, data):
+        try:
+            reply = self.handler(json.loads(data))
+        except Exception as e:
+            reply = {'ok': False, 'error': str(e)}
+        return json.dumps(reply).encode()
+
+    def _serve_socket(self):
+        while True:
             try:
-                result = subprocess.run(['gnome-screensaver-command', '-q'], 
-                                      capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    return 'is active' in result.stdout.lower()
-            except FileNotFoundError:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return  # closed
+            with self._busy, conn:
+                try:
+                    conn.settimeout(2.0)
+                    with conn.makefile('rb') as f:
+                        line = f.readline()
+                    conn.sendall(self._reply(line) + b'\n')
+                except OSError:
+                    pass
+
+    def _serve_pipe(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                return  # closed
+            with self._busy, conn:
+                try:
+                    conn.send_bytes(self._reply(conn.recv_bytes()))
+                except (OSError, EOFError):
+                    pass
+
+    def close(self):
+        if self._listener is None:
+            return
+        # A "stop" request ends the loop while its reply is still being sent
+        if self._busy.acquire(timeout=1.0):
+            self._busy.release()
+        if SYSTEM == 'Windows':
+            self._listener.close()
+        else:
+            import socket
+            try:
+                # Unblocks accept() in the serving thread
+                self._listener.shutdown(socket.SHUT_RDWR)
+            except OSError:
                 pass
-    except Exception:
-        pass
-    return False
+            self._listener.close()
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+            self._release()
+        self._listener = None
+
+    def _release(self):
+        # The lock file itself stays: unlinking it would let a third
+        # instance lock a fresh inode while a second still holds the old one
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+
+def print_control_reply(reply):
+    """Print a control reply as ``key: value`` lines; return False on error"""
+    if not reply.get('ok'):
+        print(f"Error: {reply.get('error', 'request failed')}")
+        return False
+    for key, value in reply.items():
+        if key == 'sessions':
+            for name, stats in value.items():
+                print(f"  {name}: " + ", ".join(f"{k} {v}" for k, v in stats.items()))
+        elif key != 'ok':
+            print(f"{key}: {value}")
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Settings watcher
+#
+# The running loop follows edits to the settings file without a restart.
+# Watchers block on the platform's change notification for the file's
+# directory (so write-temp-and-rename replacements are seen too) and parse
+# the file only when its mtime, inode or size actually changed; polling the
+# same signature is the fallback.
+# ---------------------------------------------------------------------------
+
+SETTINGS_WATCHERS = {}
+
+
+def register_settings_watcher(cls):
+    """Class decorator adding a settings watcher to the registry"""
+    SETTINGS_WATCHERS[cls.name] = cls
+    return cls
+
+
+class SettingsWatcherUnavailable(BackendUnavailable):
+    """Raised when a change notification backend cannot be used"""
+
+
+class SettingsWatcher:
+    """Calls ``callback(settings)`` from a background thread when the file changes
+
+    Problems reading the file go to ``log`` (the run loop's LoopLog).
+    """
+    name = 'base'
+
+    def __init__(self, path, callback, log=None):
+        self.path = os.fspath(path)
+        self.callback = callback
+        self.log = log or LoopLog()
+        self.reloads = 0
+        self._signature = self._stat()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_ino, st.st_size
+
+    def _check(self):
+        """Parse and deliver the file if it changed since the last parse"""
+        signature = self._stat()
+        if signature == self._signature:
+            return
+        self._signature = signature
+        if signature is None:
+            return  # deleted: keep running with the current settings
+        try:
+            with open(self.path, 'r') as f:
+                settings = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            settings = None
+        if not isinstance(settings, dict):
+            self.log.warning(f"Could not load settings from {self.path}", event='settings')
+            return
+        self.reloads += 1
+        metrics.inc('move_settings_reloads_total')
+        self.callback(settings)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._watch, name=f'settings-{self.name}', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        raise NotImplementedError
+
+
+@register_settings_watcher
+class PollingSettingsWatcher(SettingsWatcher):
+    """Fallback that stats the file every ``poll_interval`` seconds"""
+    name = 'poll'
+
+    def __init__(self, path, callback, poll_interval=2, log=None):
+        super().__init__(path, callback, log)
+        self.poll_interval = poll_interval
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self._check()
+
+
+class _PipeSettingsWatcher(SettingsWatcher):
+    """Watcher blocking on file descriptors; a pipe lets stop() interrupt it"""
+
+    def __init__(self, path, callback, log=None):
+        super().__init__(path, callback, log)
+        self._wake_r, self._wake_w = os.pipe()
+
+    def _close_handles(self):
+        os.close(self._wake_r)
+
+    def _watch(self):
+        try:
+            while not self._stop.is_set() and self._wait():
+                self._check()
+        finally:
+            self._close_handles()
+
+    def _wait(self):
+        """Block until the directory changes; return False once stopped"""
+        raise NotImplementedError
+
+    def stop(self):
+        if self._stop.is_set():
+            return
+        super().stop()
+        if self._thread is None:
+            self._close_handles()
+        else:
+            os.write(self._wake_w, b'x')
+        os.close(self._wake_w)
+
+
+SETTINGS_WATCHER_ORDER = {
+    'Linux': ['inotify'],
+    'Darwin': ['kqueue'],
+    'Windows': ['win32'],
+}
 
-def show_activity_indicator():
-    """Show a small visual indicator that the tool is active"""
+
+def open_settings_watcher(path, callback, poll_interval=2, log=None):
+    """Start the best watcher for ``path``, falling back to polling its signature"""
+    platform_backends()
+    for name in SETTINGS_WATCHER_ORDER.get(SYSTEM, []):
+        try:
+            return SETTINGS_WATCHERS[name](path, callback, log).start()
+        except (BackendUnavailable, OSError):
+            pass
+    return PollingSettingsWatcher(path, callback, poll_interval, log).start()
+
+
+# ---------------------------------------------------------------------------
+# Activity history
+#
+# An optional recorder keeps one fixed-width entry per loop decision in a
+# memory-mapped ring file of bounded size. Columns are stored separately
+# (times, idle seconds, action codes, idle buckets), so summaries over
+# months of history are a few C-speed byte counts instead of a Python loop.
+# ---------------------------------------------------------------------------
+
+HISTORY_MAGIC = b'MVHIST01'
+HISTORY_HEADER = 32  # magic, capacity (u64), head (u64), count (u64)
+HISTORY_CAPACITY = 524288  # 8 bytes per entry: 4 MiB, months of decisions
+HISTORY_ACTIONS = ('active', 'interval', 'move', 'locked', 'paused')
+# Upper bounds (seconds) of the idle buckets reported by --stats
+HISTORY_IDLE_BUCKETS = (5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+HISTORY_BATTERY = 0x80  # set in the bucket byte for decisions made on battery
+
+
+def _history_path():
+    return os.path.join(_cache_dir(), 'history.bin')
+
+
+class HistoryFile:
+    """Column-oriented ring of (time, idle, action, bucket) entries in one mmap
+
+    Layout after the header: ``capacity`` u32 wall-clock seconds, then u16
+    idle seconds, then u8 action codes, then u8 idle bucket indexes.
+    """
+
+    def __init__(self, path=None, capacity=HISTORY_CAPACITY, writable=False):
+        import mmap
+        self.path = path or _history_path()
+        size = HISTORY_HEADER + capacity * 8
+        if writable:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        else:
+            fd = os.open(self.path, os.O_RDONLY)
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.read(HISTORY_HEADER)
+            valid = header[:8] == HISTORY_MAGIC
+            if valid:
+                capacity = int.from_bytes(header[8:16], 'little')
+                size = HISTORY_HEADER + capacity * 8
+            elif not writable:
+                raise ValueError(f"{self.path} is not a move history file")
+            if writable and os.fstat(fd).st_size != size:
+                os.ftruncate(fd, size)
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            self._mm = mmap.mmap(fd, size, access=access)
+        finally:
+            os.close(fd)
+        self.capacity = capacity
+        if not valid:
+            self._mm[:16] = HISTORY_MAGIC + capacity.to_bytes(8, 'little')
+            self._set_position(0, 0)
+        c = capacity
+        self._times = memoryview(self._mm)[HISTORY_HEADER:HISTORY_HEADER + 4 * c].cast('I')
+        self._idle = memoryview(self._mm)[HISTORY_HEADER + 4 * c:HISTORY_HEADER + 6 * c].cast('H')
+        self._actions = memoryview(self._mm)[HISTORY_HEADER + 6 * c:HISTORY_HEADER + 7 * c]
+        self._buckets = memoryview(self._mm)[HISTORY_HEADER + 7 * c:HISTORY_HEADER + 8 * c]
+
+    def position(self):
+        """Return ``(head, count)``: next slot to write and entries stored"""
+        return (int.from_bytes(self._mm[16:24], 'little'),
+                int.from_bytes(self._mm[24:32], 'little'))
+
+    def _set_position(self, head, count):
+        self._mm[16:32] = head.to_bytes(8, 'little') + count.to_bytes(8, 'little')
+
+    def append(self, entries):
+        """Write ``[(time, idle, action_code, on_battery), ...]``, overwriting the oldest"""
+        import bisect
+        head, count = self.position()
+        for when, idle, action, on_battery in entries:
+            idle = min(int(idle), 0xFFFF)
+            self._times[head] = int(when)
+            self._idle[head] = idle
+            self._actions[head] = action
+            bucket = bisect.bisect_right(HISTORY_IDLE_BUCKETS, idle)
+            self._buckets[head] = bucket | HISTORY_BATTERY if on_battery else bucket
+            head = (head + 1) % self.capacity
+            count = min(count + 1, self.capacity)
+        # Header last, so a concurrent reader never counts a half-written entry
+        self._set_position(head, count)
+
+    def columns(self):
+        """Return the four columns oldest-first as bytes-like objects"""
+        head, count = self.position()
+        start = (head - count) % self.capacity
+        result = []
+        for column in (self._times, self._idle, self._actions, self._buckets):
+            if start + count <= self.capacity:
+                result.append(column[start:start + count])
+            else:
+                # Wrapped: stitch the two halves (one copy, a few MB at most)
+                result.append(column[start:].tobytes() + column[:head].tobytes())
+        times, idle = result[0], result[1]
+        if isinstance(times, bytes):
+            times, idle = memoryview(times).cast('I'), memoryview(idle).cast('H')
+        return times, idle, bytes(result[2]), bytes(result[3])
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        for view in (self._times, self._idle, self._actions, self._buckets):
+            view.release()
+        self._mm.close()
+
+
+class ActivityRecorder:
+    """Records Move decisions into a HistoryFile without touching the hot path
+
+    ``on_decision`` (a Move listener) only appends a tuple to a deque; a
+    background thread moves the entries into the mmap every
+    ``flush_interval`` seconds and on close. ``on_battery()`` tells whether
+    a decision was made on battery power.
+    """
+
+    def __init__(self, path=None, capacity=HISTORY_CAPACITY, flush_interval=30,
+                 on_battery=lambda: False):
+        import collections
+        self.history = HistoryFile(path, capacity, writable=True)
+        self.flush_interval = flush_interval
+        self.on_battery = on_battery
+        self._pending = collections.deque()
+        self._codes = {name: code for code, name in enumerate(HISTORY_ACTIONS)}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='history', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def on_decision(self, now, action, idle_time, deadline):
+        self._pending.append((time.time(), idle_time or 0, self._codes[action], self.on_battery()))
+
+    def flush(self):
+        entries = []
+        while self._pending:
+            entries.append(self._pending.popleft())
+        if entries:
+            self.history.append(entries)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.flush()
+        self.history.flush()
+        self.history.close()
+
+
+def summarize_history(history, now=None):
+    """Summarize a HistoryFile: decision counts, lock time, idle distribution"""
+    times, idle, actions, buckets = history.columns()
+    count = len(actions)
+    summary = {'entries': count, 'capacity': history.capacity}
+    if not count:
+        return summary
+    now = time.time() if now is None else now
+    summary['first'] = times[0]
+    summary['last'] = times[count - 1]
+    summary['days'] = (times[count - 1] - times[0]) / 86400
+    summary['decisions'] = {name: actions.count(code) for code, name in enumerate(HISTORY_ACTIONS)}
+    # A locked/paused decision lasts until the next decision (the wake-up);
+    # they are rare because the loop sleeps until woken, so a find() walk is cheap
+    for name in ('locked', 'paused'):
+        code = bytes([HISTORY_ACTIONS.index(name)])
+        seconds = 0
+        index = actions.find(code)
+        while index != -1:
+            end = times[index + 1] if index + 1 < count else min(now, times[index] + 86400)
+            seconds += max(end - times[index], 0)
+            index = actions.find(code, index + 1)
+        summary[f'{name}_seconds'] = seconds
+    on_battery = [buckets.count(i | HISTORY_BATTERY) for i in range(len(HISTORY_IDLE_BUCKETS) + 1)]
+    summary['idle_buckets'] = [buckets.count(i) + on_battery[i]
+                               for i in range(len(HISTORY_IDLE_BUCKETS) + 1)]
+    summary['battery_decisions'] = sum(on_battery)
+    return summary
+
+
+def print_history_stats(path=None):
+    """Print the --stats report for the history file; return False if missing"""
+    started = time.perf_counter()
     try:
-        # Get screen dimensions
-        screen_width, screen_height = pyautogui.size()
-        center_x, center_y = screen_width // 2, screen_height // 2
-        
-        # Create a small circle indicator
-        indicator_radius = 8
-        for i in range(10):  # Show for 1 second (10 * 0.1s)
-            angle = (2 * math.pi * i) / 10
-            x = center_x + int(indicator_radius * math.cos(angle))
-            y = center_y + int(indicator_radius * math.sin(angle))
-            
-            # Draw a small circle by moving mouse in a tiny circle
-            pyautogui.moveTo(x, y, duration=0.05)
-            time.sleep(0.05)
-        
-        # Return to center
-        pyautogui.moveTo(center_x, center_y, duration=0.1)
-        
-    except Exception:
-        # If visual indicator fails, just continue silently
-        pass
+        history = HistoryFile(path)
+    except (OSError, ValueError) as e:
+        print(f"No activity history ({e}); record with --record")
+        return False
+    try:
+        summary = summarize_history(history)
+    finally:
+        history.close()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    size_mb = (HISTORY_HEADER + summary['capacity'] * 8) / 1048576
+    print(f"History: {history.path} ({summary['entries']} of {summary['capacity']} entries, {size_mb:.1f} MiB)")
+    if not summary['entries']:
+        return True
+    days = summary['days']
+    per_day = max(days, 1)  # rates over less than a day are not extrapolated
+    first = time.strftime('%Y-%m-%d %H:%M', time.localtime(summary['first']))
+    last = time.strftime('%Y-%m-%d %H:%M', time.localtime(summary['last']))
+    print(f"Span: {first} .. {last} ({days:.1f} days)")
+    decisions = summary['decisions']
+    print(f"Moves: {decisions['move']} ({decisions['move'] / per_day:.1f}/day)")
+    print(f"Skipped: {decisions['active']} active, {decisions['interval']} waiting for the interval, "
+          f"{decisions['locked']} locked, {decisions['paused']} paused")
+    print(f"Locked: {summary['locked_seconds'] / 3600:.1f} h ({summary['locked_seconds'] / 3600 / per_day:.1f} h/day), "
+          f"paused: {summary['paused_seconds'] / 3600:.1f} h")
+    total = summary['entries']
+    print(f"On battery: {summary['battery_decisions'] / total:.1%} of checks")
+    print("Idle time at each check:")
+    labels = [f"< {b}s" for b in HISTORY_IDLE_BUCKETS] + [f">= {HISTORY_IDLE_BUCKETS[-1]}s"]
+    for label, n in zip(labels, summary['idle_buckets']):
+        share = n / total
+        print(f"  {label:>8} {share:6.1%} {'#' * round(share * 40)}")
+    print(f"Scanned in {elapsed_ms:.1f} ms")
+    return True
+
+
+# (low, high) for numeric live settings; the others only have to be >= 0
+SETTING_RANGES = {
+    'circle_steps': (1, 10000),
+    'circle_radius': (1, 1000),
+    'cycle_time': (0, 60),
+}
+
+
+def check_settings(settings):
+    """Raise ValueError unless every live setting in ``settings`` is usable"""
+    for key, value in settings.items():
+        if key == 'pattern':
+            if value not in TRAJECTORIES:
+                raise ValueError(f"unknown pattern '{value}'")
+            continue
+        if key == 'circle_steps':
+            # Used as a step count: 20.5 would only fail at the next move
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError("circle_steps must be a whole number")
+        elif not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+            raise ValueError(f"{key} must be a number")
+        low, high = SETTING_RANGES.get(key, (0, None))
+        if high is None and value < low:
+            raise ValueError(f"{key} must be non-negative")
+        if high is not None and not low <= value <= high:
+            raise ValueError(f"{key} must be between {low} and {high}")
+
+
+def next_action(locked, idle_time, now, last_move_time, interval, idle_threshold):
+    """Decide one pass of the run loop
+
+    Returns ``(action, deadline)``: action is 'locked', 'active', 'move' or
+    'interval', and deadline is when the next pass is due (None means
+    "until woken", and 'move' passes are due immediately after moving).
+    Shared by Move.run and SessionDaemon so both follow the same rules.
+    """
+    if locked:
+        # Nothing can happen until the monitor reports an unlock
+        return 'locked', None
+    if idle_time < idle_threshold:
+        # Idle time cannot reach the threshold any sooner than this, and no
+        # move is due before the interval since the last one has passed
+        deadline = now + idle_threshold - idle_time
+        if last_move_time is not None:
+            deadline = max(deadline, last_move_time + interval)
+        return 'active', deadline
+    # The interval should be the total time including idle detection
+    if last_move_time is None or now - last_move_time >= interval:
+        return 'move', now
+    return 'interval', last_move_time + interval
+
 
 class Move:
     def __init__(self):
-        self.settings_file = Path.home() / '.move_settings.json'
+        self.settings_file = os.path.join(os.path.expanduser('~'), '.move_settings.json')
         self.running = False
         self.circle_radius = 25  # pixels
         self.circle_steps = 20   # number of steps to complete a circle
         self.idle_threshold = 30  # seconds of idle time before moving
+        self.pattern = 'circle'  # trajectory pattern, see TRAJECTORIES
+        self.cycle_time = 0.5  # seconds budget for one whole movement
+        self.probe_budget = 0.5  # seconds the idle and lock probes may take per pass
+        self.lock_monitor_name = 'auto'
+        self.lock_poll_seconds = 10  # polling period when no lock notifications exist
+        self.lock_monitor = None
+        self.scheduler = Scheduler()
+        self.engine = 'mouse'  # 'mouse' moves the pointer, 'inhibit' holds an inhibitor
+        self.inhibitor = None
+        self.interval_minutes = 1
+        self.interval_seconds = 0
+        self.paused = False  # set over the control socket
+        self.moves = 0
+        self.last_move_time = None
+        self._file_settings = {}  # last contents read from or written to settings_file
+        self.indicator_name = 'auto'  # see INDICATORS; 'none' shows nothing
+        self.indicator = None  # Indicator, opened by run() unless injected
+        self.record_history = False  # keep an on-disk activity history (see --stats)
+        self.power_policy = 'auto'  # 'auto' saves power on battery, 'off' ignores the power source
+        self.battery_slack = 5.0  # seconds deadlines may slip on battery
+        self.battery_pattern = 'nudge'
+        self.power = None  # PowerPolicy, created by run() unless injected
+        self.log_format = 'text'  # 'json' writes one JSON object per log line
+        self.log = LoopLog(clock=lambda: self.scheduler.clock())
+        self._listeners = []
         
     def load_settings(self):
         """Load settings from file or return defaults"""
@@ -143,13 +2546,25 @@ class Move:
             'interval_seconds': 0,
             'circle_radius': 25,
             'circle_steps': 20,
-            'idle_threshold': 30
+            'idle_threshold': 30,
+            'lock_poll_seconds': 10,
+            'engine': 'mouse',
+            'pattern': 'circle',
+            'cycle_time': 0.5,
+            'probe_budget': 0.5,
+            'record_history': False,
+            'power_policy': 'auto',
+            'battery_slack': 5.0,
+            'battery_pattern': 'nudge',
+            'log_format': 'text',
+            'indicator': 'auto'
         }
         
-        if self.settings_file.exists():
+        if os.path.exists(self.settings_file):
             try:
                 with open(self.settings_file, 'r') as f:
                     settings = json.load(f)
+                    self._file_settings = dict(settings)
                     # Merge with defaults to handle missing keys
                     for key, value in default_settings.items():
                         if key not in settings:
@@ -161,104 +2576,839 @@ class Move:
         return default_settings
     
     def save_settings(self, settings):
-        """Save settings to file"""
+        """Save settings to file atomically
+        
+        Readers (including a running instance's watcher) see either the old
+        or the new file, never a truncated one: the JSON goes to a temp file
+        in the same directory, which is then renamed over the original.
+        """
+        tmp = f'{self.settings_file}.{os.getpid()}.tmp'
         try:
-            with open(self.settings_file, 'w') as f:
+            with open(tmp, 'w') as f:
                 json.dump(settings, f, indent=2)
-        except IOError as e:
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.settings_file)
+            self._file_settings = dict(settings)
+        except OSError as e:
             print(f"Warning: Could not save settings: {e}")
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
     
     def get_interval_seconds(self, minutes, seconds):
         """Convert minutes and seconds to total seconds"""
         return minutes * 60 + seconds
     
+    # Settings that can change while the loop runs
+    LIVE_SETTINGS = ('interval_minutes', 'interval_seconds', 'circle_radius', 'circle_steps',
+                     'idle_threshold', 'pattern', 'cycle_time')
+    
+    def current_settings(self):
+        """Return the settings in effect, in settings-file form"""
+        return {
+            'interval_minutes': self.interval_minutes,
+            'interval_seconds': self.interval_seconds,
+            'circle_radius': self.circle_radius,
+            'circle_steps': self.circle_steps,
+            'idle_threshold': self.idle_threshold,
+            'lock_poll_seconds': self.lock_poll_seconds,
+            'engine': self.engine,
+            'pattern': self.pattern,
+            'cycle_time': self.cycle_time,
+            'probe_budget': self.probe_budget,
+            'record_history': self.record_history,
+            'power_policy': self.power_policy,
+            'battery_slack': self.battery_slack,
+            'battery_pattern': self.battery_pattern,
+            'log_format': self.log_format,
+            'indicator': self.indicator_name
+        }
+    
+    def apply_settings(self, changes):
+        """Validate and apply live setting changes all at once
+        
+        Raises ValueError (leaving every setting untouched) if any value is
+        invalid, and wakes the loop so the new values take effect now.
+        """
+        unknown = set(changes) - set(self.LIVE_SETTINGS)
+        if unknown:
+            raise ValueError(f"cannot change {', '.join(sorted(unknown))} while running")
+        new = {key: getattr(self, key) for key in self.LIVE_SETTINGS}
+        new.update(changes)
+        check_settings(new)
+        if self.get_interval_seconds(new['interval_minutes'], new['interval_seconds']) <= 0:
+            raise ValueError("interval must be greater than 0")
+        for key, value in new.items():
+            setattr(self, key, value)
+        self.scheduler.wake()
+        return {key: new[key] for key in changes}
+    
+    def add_listener(self, callback):
+        """Call ``callback(now, action, idle_time, deadline)`` after every decision
+        
+        ``action`` is a ``next_action`` result or 'paused'; ``deadline`` is
+        when the loop will look again (None: when woken).
+        """
+        self._listeners.append(callback)
+    
+    def _notify(self, now, action, idle_time, deadline):
+        for callback in self._listeners:
+            callback(now, action, idle_time, deadline)
+    
+    def reload_settings(self, settings):
+        """Apply live settings edited in the settings file (watcher thread)"""
+        # Only keys edited in the file apply, so command line overrides
+        # survive unrelated edits
+        previous, self._file_settings = self._file_settings, dict(settings)
+        changes = {key: settings[key] for key in self.LIVE_SETTINGS
+                   if key in settings and settings[key] != previous.get(key)
+                   and settings[key] != getattr(self, key)}
+        if not changes:
+            return
+        try:
+            applied = self.apply_settings(changes)
+        except ValueError as e:
+            self.log.warning(f"Ignoring settings change in {self.settings_file}: {e}", event='settings')
+            return
+        self.log.info("Settings reloaded: " + ", ".join(f"{key}={value}" for key, value in applied.items()),
+                      event='settings', **applied)
+    
+    def status(self):
+        """Return the state reported over the control socket"""
+        since = None
+        if self.last_move_time is not None:
+            since = round(self.scheduler.clock() - self.last_move_time, 1)
+        power = self.power.describe() if self.power is not None else None
+        return dict(self.current_settings(), pid=os.getpid(), running=self.running,
+                    paused=self.paused, moves=self.moves, since_move=since, power=power)
+    
+    def control(self, request):
+        """Handle one control-socket request (runs on the control thread)"""
+        cmd = request.get('cmd')
+        if cmd == 'pause':
+            self.paused = True
+        elif cmd == 'resume':
+            self.paused = False
+        elif cmd == 'stop':
+            self.log.info("Stop requested over the control socket", event='stop')
+            self.running = False
+        elif cmd == 'set':
+            self.apply_settings(request.get('settings', {}))
+            if request.get('save'):
+                self.save_settings(self.current_settings())
+        elif cmd not in ('ping', 'status'):
+            return {'ok': False, 'error': f"unknown command: {cmd}"}
+        self.scheduler.wake()
+        return dict(self.status(), ok=True)
+    
     def move_mouse_circle(self):
-        """Move mouse in a small circular pattern"""
+        """Move mouse along the configured pattern (a small circle by default)
+        
+        Returns True if the whole path was emitted.
+        """
         try:
-            # Get current mouse position
-            start_x, start_y = pyautogui.position()
-            
-            # Calculate circle points
-            for i in range(self.circle_steps):
-                if not self.running:
-                    break
-                    
-                angle = (2 * math.pi * i) / self.circle_steps
-                x = start_x + int(self.circle_radius * math.cos(angle))
-                y = start_y + int(self.circle_radius * math.sin(angle))
-                
-                # Move mouse to calculated position
-                pyautogui.moveTo(x, y, duration=0.1)
-                time.sleep(0.05)  # Small delay between movements
-            
-            # Return to original position
-            pyautogui.moveTo(start_x, start_y, duration=0.1)
+            pattern, steps, cycle_time = self.pattern, self.circle_steps, self.cycle_time
+            if self.power is not None:
+                pattern, steps, cycle_time = self.power.movement(pattern, steps, cycle_time)
+            offsets = trajectory_offsets(pattern, self.circle_radius, steps)
+            return emit_trajectory(offsets, cycle_time, lambda: self.running)
             
-        except pyautogui.FailSafeException:
-            print("\nMove stopped due to fail-safe (mouse moved to corner)")
+        except FailSafeException:
+            self.log.warning("Move stopped due to fail-safe (mouse moved to corner)", event='stop')
             self.running = False
         except Exception as e:
-            print(f"Error during mouse movement: {e}")
+            self.log.warning(f"Error during mouse movement: {e}", event='stop')
             self.running = False
+        return False
+    
+    def _moved_since(self, last_input):
+        """Return True if the last input was (probably) our own movement"""
+        if self.last_move_time is None:
+            return False
+        return self.last_move_time <= last_input <= self.last_move_time + self.cycle_time + 1
+    
+    def keep_awake(self):
+        """Perform one keep-awake action with the configured engine
+        
+        Returns True if something was actually done (a completed movement
+        or a newly taken inhibitor).
+        """
+        with metrics.timer('move_phase_seconds', phase='move'):
+            return self._keep_awake()
+    
+    def _keep_awake(self):
+        if self.inhibitor is not None:
+            if self.inhibitor.held:
+                return False
+            try:
+                self.inhibitor.acquire()
+                metrics.inc('move_moves_total', engine='inhibit')
+                self.log.info(f"Holding {self.inhibitor.name} inhibitor", event='inhibit')
+                return True
+            except Exception as e:
+                self.log.warning(f"Inhibitor {self.inhibitor.name} failed ({e}) - falling back to mouse movement",
+                                 event='inhibit')
+                self.inhibitor = None
+        with metrics.timer('move_cycle_seconds', pattern=self.pattern):
+            moved = self.move_mouse_circle()
+        if moved:
+            metrics.inc('move_moves_total', engine='mouse')
+        return moved
+    
+    def replace_lock_monitor(self):
+        """Swap a lock monitor whose thread died for the polling fallback
+
+        Returns the new poll interval (before any battery scaling).
+        """
+        failed = self.lock_monitor
+        reason = f" ({failed.error})" if failed.error else ""
+        self.log.warning(f"Lock monitor {failed.name} stopped{reason} - "
+                         f"polling every {self.lock_poll_seconds:g} s", event='lock')
+        self.lock_monitor = PollingLockMonitor(self.lock_poll_seconds)
+        if self.power is not None and self.power.saving:
+            self.lock_monitor.poll_interval *= self.power.poll_scale
+        self.lock_monitor.add_listener(self.scheduler.wake)
+        set_lock_monitor(self.lock_monitor.start())
+        return self.lock_poll_seconds
+
+    def relax(self):
+        """Let the machine idle again (screen locked or loop exiting)"""
+        if self.inhibitor is not None and self.inhibitor.held:
+            self.inhibitor.release()
+            self.log.info(f"Released {self.inhibitor.name} inhibitor", event='inhibit')
     
     def run(self, interval_minutes, interval_seconds, save_settings_flag):
         """Main execution loop"""
-        interval = self.get_interval_seconds(interval_minutes, interval_seconds)
+        self.interval_minutes = interval_minutes
+        self.interval_seconds = interval_seconds
         
         # Save settings if requested
         if save_settings_flag:
-            settings = {
-                'interval_minutes': interval_minutes,
-                'interval_seconds': interval_seconds,
-                'circle_radius': self.circle_radius,
-                'circle_steps': self.circle_steps,
-                'idle_threshold': self.idle_threshold
-            }
-            self.save_settings(settings)
+            self.save_settings(self.current_settings())
             print(f"Settings saved: {interval_minutes}m {interval_seconds}s interval")
         
         print(f"Move started with {interval_minutes}m {interval_seconds}s interval")
         print(f"Idle threshold: {self.idle_threshold} seconds")
         print(f"Total cycle: {interval_minutes}m {interval_seconds}s (including idle detection)")
         print("Press Ctrl+C to stop")
+        # From here on the loop logs through self.log, which never blocks
+        
+        if self.lock_monitor is None:
+            self.lock_monitor = open_lock_monitor(self.lock_monitor_name, self.lock_poll_seconds)
+        
+        if self.engine == 'inhibit' and self.inhibitor is None:
+            self.inhibitor = open_inhibitor()
+            if self.inhibitor is None:
+                self.log.warning("No inhibitor available - falling back to mouse movement", event='inhibit')
+        if self.inhibitor is not None:
+            self.log.info(f"Engine: {self.inhibitor.name} inhibitor", event='inhibit')
+        
+        if self.power is None:
+            self.power = PowerPolicy(self.power_policy, self.battery_slack, self.battery_pattern,
+                                     clock=self.scheduler.clock)
+        if self.indicator is None:
+            try:
+                self.indicator = open_indicator(self.indicator_name)
+            except IndicatorUnavailable as e:
+                self.log.warning(f"Indicator {self.indicator_name} unavailable ({e}) - showing none",
+                                 event='indicator')
+                self.indicator = NullIndicator()
+        # Inhibitors and indicators are only picked here, so record them now
+        capabilities.save(log=self.log)
+        lock_poll = getattr(self.lock_monitor, 'poll_interval', None)
         
+        set_lock_monitor(self.lock_monitor)
         self.running = True
-        last_move_time = 0
+        self.lock_monitor.add_listener(self.scheduler.wake)
+        self.last_move_time = None
         
         try:
             while self.running:
-                current_time = time.time()
-                
-                # Check if screen is locked
-                if is_screen_locked():
-                    print("Screen is locked - skipping movement")
-                    time.sleep(10)  # Check again in 10 seconds
+                if self.lock_monitor.failed:
+                    # Waiting "until woken" while locked needs a live monitor
+                    lock_poll = self.replace_lock_monitor()
+                if self.paused:
+                    metrics.inc('move_skips_total', reason='paused')
+                    self.log.state('paused', "Paused", label="Paused")
+                    self.indicator.update('paused', self.moves)
+                    self._notify(self.scheduler.clock(), 'paused', None, None)
+                    self.relax()
+                    # Resumed (or stopped) over the control socket
+                    self.scheduler.sleep_until(None)
                     continue
                 
-                # Check if machine has been idle long enough
-                idle_time = get_idle_time()
-                if idle_time < self.idle_threshold:
-                    print(f"Machine active (idle {idle_time:.1f}s) - skipping movement")
-                    time.sleep(10)  # Check again in 10 seconds
+                # Lock and idle probes run concurrently under one latency budget
+                with metrics.timer('move_phase_seconds', phase='probe'):
+                    sample = probes.sample(['lock', 'idle'], self.probe_budget)
+                if self.power.update():
+                    self.log.info(f"Power source: {self.power.describe()}", event='power',
+                                  on_battery=self.power.on_battery, saving=self.power.saving)
+                    if lock_poll is not None:
+                        scale = self.power.poll_scale if self.power.saving else 1
+                        self.lock_monitor.poll_interval = lock_poll * scale
+                # Taken after probing so a slow probe cannot skew the interval math
+                current_time = self.scheduler.clock()
+                idle_time = sample['idle']
+                # Interval and threshold are re-read every pass so live changes apply
+                interval = self.get_interval_seconds(self.interval_minutes, self.interval_seconds)
+                action, deadline = next_action(sample['lock'], idle_time, current_time,
+                                               self.last_move_time, interval, self.idle_threshold)
+                # On battery the wakeup lands on a coarse grid shared with other timers
+                deadline = self.power.coalesce(deadline)
+                self._notify(current_time, action, idle_time, deadline)
+                
+                if action == 'move':
+                    if self.inhibitor is None:
+                        self.log.state('move', f"Machine idle {idle_time:.1f}s - moving mouse",
+                                       label="Moving mouse", idle=round(idle_time, 1))
+                    if self.inhibitor is not None and self.inhibitor.held:
+                        # Already holding the inhibitor: nothing is done, nothing counted
+                        self.indicator.update('move', self.moves)
+                    else:
+                        # Drawn on the indicator thread while the pointer moves
+                        self.indicator.update('move', self.moves + 1)
+                        if self.keep_awake():
+                            self.moves += 1
+                    self.last_move_time = current_time
                     continue
                 
-                # Check if enough time has passed since last movement
-                # The interval should be the total time including idle detection
-                if current_time - last_move_time >= interval:
-                    print(f"Machine idle {idle_time:.1f}s - moving mouse")
-                    # Show visual indicator only when actually moving
-                    show_activity_indicator()
-                    self.move_mouse_circle()
-                    last_move_time = current_time
-                else:
-                    # Wait a bit before checking again
-                    time.sleep(10)
+                if action == 'locked':
+                    self.log.state('locked', "Screen is locked - skipping movement", label="Screen locked")
+                    self.indicator.update('locked', self.moves)
+                    self.relax()
+                elif action == 'active' and not self._moved_since(current_time - idle_time):
+                    # An idle reset caused by our own movement is not the user coming back
+                    self.log.state('active', f"Machine active (idle {idle_time:.1f}s) - skipping movement",
+                                   label="Machine active", idle=round(idle_time, 1))
+                    self.indicator.update('active', self.moves)
+                metrics.inc('move_skips_total', reason=action)
+                self.scheduler.sleep_until(deadline)
                     
         except KeyboardInterrupt:
-            print("\nMove stopped by user")
+            self.log.info("Move stopped by user", event='stop')
+            self.running = False
+        finally:
+            self.lock_monitor.stop()
+            if self.inhibitor is not None:
+                self.relax()
+                self.inhibitor.close()
+            self.indicator.close()
+            self.log.close()
+
+# ---------------------------------------------------------------------------
+# Multi-session daemon
+#
+# One asyncio loop serves many displays (terminal servers, Xvfb farms). Each
+# session is a slotted object plus one task sleeping until its own deadline,
+# so hundreds of sessions share one interpreter, one set of loaded backends
+# and a small pool of worker threads for the probes that make X round trips.
+# ---------------------------------------------------------------------------
+
+# Seconds one blocking backend call (probe or pointer move) may take before
+# the session backs off; a hung display must not hold the others up
+SESSION_TIMEOUT = 5.0
+
+
+class Session:
+    """Keep-awake state and backends for one display served by SessionDaemon"""
+    __slots__ = ('name', 'idle_source', 'input_backend', 'lock_monitor', 'interval',
+                 'circle_radius', 'circle_steps', 'idle_threshold', 'pattern', 'cycle_time',
+                 'lock_poll_seconds', 'timeout', 'last_move_time', 'moves', 'skips', 'task',
+                 'wake', 'pending')
+
+    def __init__(self, name, idle_source, input_backend, lock_monitor=None, interval=60,
+                 circle_radius=25, circle_steps=20, idle_threshold=30, pattern='circle',
+                 cycle_time=0.5, lock_poll_seconds=10, timeout=SESSION_TIMEOUT):
+        self.name = name
+        self.idle_source = idle_source
+        self.input_backend = input_backend
+        self.lock_monitor = lock_monitor
+        self.interval = interval
+        self.circle_radius = circle_radius
+        self.circle_steps = circle_steps
+        self.idle_threshold = idle_threshold
+        self.pattern = pattern
+        self.cycle_time = cycle_time
+        self.lock_poll_seconds = lock_poll_seconds
+        self.timeout = timeout
+        self.last_move_time = None
+        self.moves = 0
+        self.skips = 0
+        self.task = None
+        self.wake = None
+        self.pending = None  # a backend call that timed out and may still be running
+
+    def sample(self):
+        """Return ``(locked, idle_seconds)``; may block, so runs on a worker thread"""
+        idle_time = self.idle_source.idle_seconds()
+        if self.lock_monitor is not None:
+            return self.lock_monitor.locked, idle_time
+        # Without a lock monitor an active screensaver on the display counts as locked
+        return getattr(self.idle_source, 'screensaver_on', False), idle_time
+
+    def close(self):
+        if self.lock_monitor is not None:
+            self.lock_monitor.stop()
+        self.idle_source.close()
+        self.input_backend.close()
+
+
+def open_session(config, defaults):
+    """Build a Session from a sessions-file entry merged over ``defaults``
+
+    ``display`` names the X display to serve; the special value ``fake``
+    uses the fake backends, which is how the daemon is tested headless.
+    """
+    settings = dict(defaults)
+    settings.update(config)
+    check_settings({key: settings[key] for key in Move.LIVE_SETTINGS})
+    display = settings.get('display')
+    if display == 'fake':
+        idle_source = FakeIdleSource(settings.get('idle', 0.0))
+        input_backend = FakeInputBackend()
+        lock_monitor = FakeLockMonitor()
+    else:
+        platform_backends()
+        if 'xss' not in IDLE_SOURCES:
+            raise IdleSourceUnavailable(f"X displays are not supported on {SYSTEM}")
+        try:
+            idle_source = IDLE_SOURCES['xss'](display)
+        except IdleSourceUnavailable:
+            idle_source = IDLE_SOURCES['xsync'](display)
+        try:
+            input_backend = INPUT_BACKENDS['xtest'](display)
+        except InputBackendUnavailable:
+            idle_source.close()
+            raise
+        lock_monitor = None
+    input_backend.failsafe = True
+    return Session(settings.get('name') or display, idle_source, input_backend, lock_monitor,
+                   interval=settings['interval_minutes'] * 60 + settings['interval_seconds'],
+                   circle_radius=settings['circle_radius'],
+                   circle_steps=settings['circle_steps'],
+                   idle_threshold=settings['idle_threshold'],
+                   pattern=settings['pattern'],
+                   cycle_time=settings['cycle_time'],
+                   lock_poll_seconds=settings['lock_poll_seconds'],
+                   timeout=settings.get('timeout', SESSION_TIMEOUT))
+
+
+class SessionDaemon:
+    """Serves many Sessions concurrently from one asyncio event loop
+
+    Every session runs the same ``next_action`` rules as Move.run. Probes
+    and pointer moves go through a shared pool of ``workers`` threads, each
+    bounded by the session's ``timeout``, so a slow or hung X server stalls
+    only its own session; movements are paced with ``asyncio.sleep`` so one
+    session's cycle never delays another's.
+    """
+
+    def __init__(self, workers=4, log=None):
+        self.sessions = {}
+        self.workers = workers
+        self.log = log or LoopLog()
+        self.running = False
+        self._loop = None
+        self._executor = None
+        self._stopped = None
+
+    def add(self, session):
+        """Serve ``session``; call from the loop thread once the daemon runs"""
+        if session.name in self.sessions:
+            raise ValueError(f"duplicate session name: {session.name}")
+        self.sessions[session.name] = session
+        if self.running:
+            self._start(session)
+        return session
+
+    def remove(self, name):
+        """Stop serving a session and release its backends"""
+        session = self.sessions.pop(name)
+        if session.task is not None:
+            session.task.cancel()
+        session.close()
+
+    def status(self):
+        """Return ``{name: {...}}`` with per-session counters"""
+        now = self._loop.time() if self._loop is not None else None
+        return {name: {'moves': s.moves, 'skips': s.skips,
+                       'since_move': None if s.last_move_time is None or now is None
+                       else round(now - s.last_move_time, 1)}
+                for name, s in list(self.sessions.items())}
+
+    def control(self, request):
+        """Handle one control-socket request (runs on the control thread)"""
+        cmd = request.get('cmd')
+        if cmd == 'stop':
+            self.stop()
+        elif cmd not in ('ping', 'status'):
+            return {'ok': False, 'error': f"'{cmd}' is not supported in daemon mode"}
+        return {'ok': True, 'pid': os.getpid(), 'sessions': self.status()}
+
+    def stop(self):
+        self.running = False
+        if self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    async def run(self):
+        """Serve all sessions until stop() or cancellation"""
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        self._loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='move-session')
+        self._stopped = asyncio.Event()
+        self.running = True
+        try:
+            for session in list(self.sessions.values()):
+                self._start(session)
+            await self._stopped.wait()
+        finally:
             self.running = False
+            tasks = [s.task for s in self.sessions.values() if s.task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for session in self.sessions.values():
+                session.close()
+            self._executor.shutdown(wait=False)
+
+    def _start(self, session):
+        loop = self._loop
+        if session.lock_monitor is not None:
+            session.lock_monitor.add_listener(
+                lambda locked: loop.call_soon_threadsafe(self.wake, session))
+        session.task = loop.create_task(self._serve(session))
+
+    def wake(self, session):
+        """Cut ``session``'s current (or next) sleep short; loop thread only"""
+        if session.wake is None:
+            session.wake = True
+        elif session.wake is not True and not session.wake.done():
+            session.wake.set_result(True)
+
+    @staticmethod
+    def _expire(waiter):
+        if not waiter.done():
+            waiter.set_result(False)
+
+    async def _sleep(self, session, deadline):
+        # A bare future plus one timer handle: far lighter than wait_for(),
+        # which matters with hundreds of sessions asleep at once
+        if session.wake is True:
+            woken = True
+        else:
+            loop = self._loop
+            waiter = session.wake = loop.create_future()
+            handle = None
+            if deadline is not None:
+                handle = loop.call_at(max(deadline, loop.time() + Scheduler.min_sleep),
+                                      self._expire, waiter)
+            try:
+                woken = await waiter
+            finally:
+                if handle is not None:
+                    handle.cancel()
+        session.wake = None
+        metrics.inc('move_wakeups_total', reason='event' if woken else 'deadline')
+
+    async def _call(self, session, fn, *args):
+        """Run a blocking backend call on the pool, bounded by ``session.timeout``
+
+        Raises BackendUnavailable on timeout, and while a timed-out call for
+        the session is still stuck, so one hung display cannot use up the pool.
+        """
+        if session.pending is not None:
+            if not session.pending.done():
+                raise BackendUnavailable("a previous call to the display is still hung")
+            session.pending = None
+        loop = self._loop
+        future = loop.run_in_executor(self._executor, fn, *args)
+        # A bare waiter and one timer handle, as in _sleep: wait_for() costs a
+        # task per call, and a thread cannot be cancelled anyway
+        waiter = loop.create_future()
+        future.add_done_callback(lambda f: waiter.done() or waiter.set_result(True))
+        handle = loop.call_later(session.timeout, self._expire, waiter)
+        try:
+            if not await waiter:
+                session.pending = future
+                raise BackendUnavailable(f"display did not answer within {session.timeout:g} s")
+        finally:
+            handle.cancel()
+        return future.result()
+
+    async def _move(self, session):
+        import asyncio
+        backend = session.input_backend
+        offsets = trajectory_offsets(session.pattern, session.circle_radius, session.circle_steps)
+        start_x, start_y = await self._call(session, backend.position)
+        step_time = session.cycle_time / (len(offsets) + 1)
+
+        def path():
+            try:
+                for dx, dy in offsets:
+                    backend.move_to(start_x + dx, start_y + dy)
+            finally:
+                backend.move_to(start_x, start_y)
+
+        if not step_time:
+            # Nothing to pace: the whole path is one round trip to the pool
+            await self._call(session, path)
+        else:
+            try:
+                for dx, dy in offsets:
+                    await self._call(session, backend.move_to, start_x + dx, start_y + dy)
+                    await asyncio.sleep(step_time)
+            finally:
+                # Return to original position
+                await self._call(session, backend.move_to, start_x, start_y)
+        session.moves += 1
+        metrics.inc('move_moves_total', engine='mouse')
+
+    async def _serve(self, session):
+        loop = self._loop
+        try:
+            while self.running:
+                try:
+                    locked, idle_time = await self._call(session, session.sample)
+                except BackendUnavailable as e:
+                    self.log.warning(f"probe failed: {e}", event='probe', source=session.name)
+                    await self._sleep(session, loop.time() + session.lock_poll_seconds)
+                    continue
+                now = loop.time()
+                action, deadline = next_action(locked, idle_time, now, session.last_move_time,
+                                               session.interval, session.idle_threshold)
+                if action == 'move':
+                    self.log.state('move', f"idle {idle_time:.1f}s - moving mouse", source=session.name,
+                                   label="moving mouse", idle=round(idle_time, 1))
+                    try:
+                        await self._move(session)
+                    except BackendUnavailable as e:
+                        self.log.warning(f"move failed: {e}", event='move', source=session.name)
+                        await self._sleep(session, loop.time() + session.lock_poll_seconds)
+                        continue
+                    session.last_move_time = now
+                    continue
+                if action == 'locked' and session.lock_monitor is None:
+                    # Screensaver state has no notifications, so poll for the unlock
+                    deadline = now + session.lock_poll_seconds
+                session.skips += 1
+                metrics.inc('move_skips_total', reason=action)
+                await self._sleep(session, deadline)
+        except FailSafeException:
+            self.log.warning("stopped due to fail-safe (mouse moved to corner)", event='stop',
+                             source=session.name)
+        except Exception as e:
+            self.log.warning(f"stopped: {e}", event='stop', source=session.name)
+        else:
+            return
+        # A session that stops on its own is dropped; the others keep running
+        if self.sessions.get(session.name) is session:
+            del self.sessions[session.name]
+            session.close()
+
+
+def run_daemon(path, defaults, workers=4, log=None):
+    """Serve every session listed in the JSON file ``path`` until interrupted"""
+    import asyncio
+    try:
+        with open(path, 'r') as f:
+            entries = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Error: Could not load sessions from {path}: {e}")
+        return False
+    if not isinstance(entries, list):
+        print(f"Error: {path} must hold a JSON list of session objects")
+        return False
+    daemon = SessionDaemon(workers, log)
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            print(f"Warning: skipping session {index}: expected an object, got {entry!r}")
+            continue
+        entry.setdefault('name', entry.get('display') or f'session-{index}')
+        try:
+            daemon.add(open_session(entry, defaults))
+        except (BackendUnavailable, ValueError, TypeError, KeyError) as e:
+            # Bad values (a string interval, say) skip only this entry
+            print(f"Warning: skipping session {entry['name']}: {e}")
+    if not daemon.sessions:
+        print("Error: no usable sessions")
+        return False
+    try:
+        server = ControlServer(daemon.control).start()
+    except ControlError as e:
+        print(f"Error: {e}")
+        return False
+    print(f"Serving {len(daemon.sessions)} sessions from one process")
+    print("Press Ctrl+C to stop")
+    try:
+        asyncio.run(daemon.run())
+    except KeyboardInterrupt:
+        daemon.log.info("Move stopped by user", event='stop')
+    finally:
+        server.close()
+        daemon.log.close()
+    return True
+
+# ---------------------------------------------------------------------------
+# Simulation
+#
+# Replays a recorded activity trace through the unmodified Move.run loop on
+# a virtual clock with the fake backends, so a day of scheduling decisions
+# can be checked in a fraction of a second.
+# ---------------------------------------------------------------------------
+
+def load_trace(path):
+    """Read a JSON-lines activity trace as ``[record, ...]`` sorted by ``t``
+
+    Each record has ``t`` (seconds from the start) and any of ``idle``
+    (idle seconds at that moment; 0 is user input), ``lock`` (bool),
+    ``paused`` (bool), ``battery`` (bool: running on battery), ``settings``
+    (live settings to apply) or ``end``.
+    """
+    records = []
+    with open(path, 'r') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                record = json.loads(line)
+                record['t'] = float(record['t'])
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{path}:{number}: bad trace record ({e})")
+            records.append(record)
+    if not records:
+        raise ValueError(f"{path}: empty trace")
+    return sorted(records, key=lambda r: r['t'])
+
+
+def run_simulation(path, jiggler, interval_minutes, interval_seconds, out=sys.stdout):
+    """Replay the trace at ``path`` through ``jiggler.run`` on a virtual clock
+
+    Writes one JSON line per decision (``action``, ``idle``, ``next``) and
+    per wakeup to ``out``, then a summary line; returns the summary.
+    """
+    import contextlib
+    records = load_trace(path)
+    end = max(r['t'] for r in records)
+    scheduler = VirtualScheduler(end=end)
+    idle = FakeIdleSource(clock=scheduler.clock)
+    lock = FakeLockMonitor()
+    backend = FakeInputBackend()
+    # Injected movement counts as input, as it does for the native idle sources
+    backend.listeners.append(lambda x, y: idle.touch())
+    set_idle_source(idle)
+    set_input_backend(backend)
+    jiggler.scheduler = scheduler
+    jiggler.lock_monitor = lock
+    jiggler.indicator = NullIndicator()
+    jiggler.cycle_time = 0  # moves are instantaneous in virtual time
+    if jiggler.engine == 'inhibit':
+        jiggler.inhibitor = FakeInhibitor()
+    # The trace drives the power source; the real thread keeps its timer settings
+    battery = {'on': False}
+    jiggler.power = PowerPolicy(jiggler.power_policy, jiggler.battery_slack,
+                                jiggler.battery_pattern, clock=scheduler.clock,
+                                read=lambda: battery['on'])
+    jiggler.power.os_hints = False
+
+    def pause(paused):
+        jiggler.paused = paused
+        scheduler.wake()
+
+    def plug(on_battery):
+        battery['on'] = on_battery
+        jiggler.power.invalidate()
+        scheduler.wake()
+
+    events = []
+    for record in records:
+        t = record['t']
+        if 'idle' in record:
+            events.append((t, functools.partial(idle.set_idle, record['idle'])))
+        if 'lock' in record:
+            events.append((t, functools.partial(lock.set_locked, record['lock'])))
+        if 'paused' in record:
+            events.append((t, functools.partial(pause, record['paused'])))
+        if 'battery' in record:
+            events.append((t, functools.partial(plug, bool(record['battery']))))
+        if 'settings' in record:
+            events.append((t, functools.partial(jiggler.apply_settings, record['settings'])))
+    scheduler.events = events
+
+    counts = {}
+
+    def emit(record):
+        out.write(json.dumps(record) + '\n')
+
+    def on_decision(now, action, idle_time, deadline):
+        counts[action] = counts.get(action, 0) + 1
+        emit({'t': round(now, 3), 'action': action,
+              'idle': None if idle_time is None else round(idle_time, 3),
+              'next': None if deadline is None else round(deadline, 3)})
+
+    sleep_until = scheduler.sleep_until
+
+    def traced_sleep(deadline):
+        woken = sleep_until(deadline)
+        emit({'t': round(scheduler.now, 3), 'wakeup': 'event' if woken else 'deadline'})
+        return woken
+
+    scheduler.sleep_until = traced_sleep
+    jiggler.add_listener(on_decision)
+    started = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        jiggler.run(interval_minutes, interval_seconds, False)
+    summary = {'simulated_seconds': end, 'decisions': counts, 'moves': jiggler.moves,
+               'pointer_events': backend.moves, 'wakeups': scheduler.wakeups,
+               'wall_ms': round((time.perf_counter() - started) * 1000, 1)}
+    emit({'summary': summary})
+    return summary
+
+
+def print_profile():
+    """Print the per-phase timing table collected in ``metrics``"""
+    print("\nPhase       count    total (s)   mean (ms)")
+    for phase, count, total, mean_ms in metrics.phase_profile():
+        print(f"{phase:<10} {count:>6} {total:>12.3f} {mean_ms:>11.3f}")
+    for name, stats in probes.stats().items():
+        print(f"probe {name}: {stats['calls']} calls, {stats['failures']} failures, "
+              f"{stats['skips']} skipped, last {stats['last_latency_ms']:.3f} ms")
+
+def attach_to_running(args):
+    """Forward this invocation to a running instance; return False if none answers"""
+    changes = {}
+    if args.minutes is not None or args.seconds is not None:
+        changes['interval_minutes'] = args.minutes or 0
+        changes['interval_seconds'] = args.seconds or 0
+    for key, value in (('circle_radius', args.radius), ('circle_steps', args.steps),
+                       ('pattern', args.pattern), ('cycle_time', args.cycle_time),
+                       ('idle_threshold', args.idle)):
+        if value is not None:
+            changes[key] = value
+    try:
+        reply = None
+        if changes or args.save:
+            # A bare --save stores the running instance's current settings
+            reply = control_request({'cmd': 'set', 'settings': changes, 'save': args.save})
+        if reply is None or (reply.get('ok') and args.command):
+            reply = control_request({'cmd': args.command or 'status'})
+    except ControlError:
+        return False
+    if args.save and reply.get('ok') and not changes:
+        print("Move is already running - saved its current settings")
+    elif not (args.command or changes):
+        print("Move is already running - showing its status (see --pause/--resume/--stop)")
+    if not print_control_reply(reply):
+        sys.exit(1)
+    return True
 
 def main():
+    import argparse
+    # The backend choices below are this OS's, so load its backends first
+    platform_backends()
     parser = argparse.ArgumentParser(
         description="Move - Prevent screen lock with small mouse movements",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -268,6 +3418,7 @@ Examples:
   python move.py -m 2 -s 30        # 2 minutes 30 seconds interval
   python move.py -m 0 -s 45 -s     # 45 seconds interval and save settings
   python move.py --load            # Load and use saved settings
+  python move.py --pause           # Pause the instance that is already running
         """
     )
     
@@ -283,11 +3434,86 @@ Examples:
                        help='Circle radius in pixels (default: 10)')
     parser.add_argument('--steps', type=int, default=None,
                        help='Number of steps to complete circle (default: 20)')
+    parser.add_argument('--pattern', choices=sorted(TRAJECTORIES), default=None,
+                       help='Movement pattern (default: circle)')
+    parser.add_argument('--cycle-time', type=float, default=None,
+                       help='Seconds one whole movement may take (default: 0.5)')
     parser.add_argument('--idle', type=int, default=None,
                        help='Idle threshold in seconds before moving (default: 30)')
+    parser.add_argument('--idle-source', default='auto',
+                       choices=['auto'] + sorted(IDLE_SOURCES),
+                       help='Idle time backend (default: auto-detect)')
+    parser.add_argument('--input-backend', default='auto',
+                       choices=['auto'] + sorted(INPUT_BACKENDS),
+                       help='Pointer injection backend (default: auto-detect)')
+    parser.add_argument('--lock-monitor', default='auto',
+                       choices=['auto'] + sorted(LOCK_MONITORS),
+                       help='Lock state backend (default: auto-detect)')
+    parser.add_argument('--engine', choices=['mouse', 'inhibit'], default=None,
+                       help='Keep-awake engine: move the mouse or hold a sleep/idle inhibitor (default: mouse)')
+    parser.add_argument('--power-policy', choices=['auto', 'off'], default=None,
+                       help='Save power on battery: coalesce wakeups, poll less, move less (default: auto)')
+    parser.add_argument('--indicator', default=None, choices=['auto'] + sorted(INDICATORS),
+                       help='How to show activity without touching the pointer (default: auto)')
+    parser.add_argument('--log-format', choices=['text', 'json'], default=None,
+                       help='Log lines as plain text or JSON objects (default: text)')
+    parser.add_argument('--lock-poll', type=int, default=None,
+                       help='Lock polling period in seconds when no notifications are available (default: 10)')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                       help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics')
+    parser.add_argument('--stats-file', default=None,
+                       help='Periodically write JSON stats to this file')
+    parser.add_argument('--stats-interval', type=int, default=60,
+                       help='Seconds between stats file flushes (default: 60)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print per-phase timings on exit')
+    parser.add_argument('--rescan', action='store_true',
+                       help='Ignore the capability cache and probe all backends again')
+    parser.add_argument('--record', action='store_true',
+                       help='Record every decision in the on-disk activity history')
+    parser.add_argument('--stats', action='store_true',
+                       help='Summarize the recorded activity history and exit')
+    parser.add_argument('--history', default=None, metavar='FILE',
+                       help='Activity history file (default: ~/.cache/move/history.bin)')
+    parser.add_argument('--simulate', default=None, metavar='TRACE',
+                       help='Replay a JSON-lines activity trace on a virtual clock and print every decision')
+    parser.add_argument('--sessions', default=None, metavar='FILE',
+                       help='Daemon mode: serve every display listed in this JSON file from one process')
+    control = parser.add_mutually_exclusive_group()
+    for command, text in (('status', 'Show the state of the running instance'),
+                          ('pause', 'Pause the running instance'),
+                          ('resume', 'Resume the running instance'),
+                          ('stop', 'Stop the running instance')):
+        control.add_argument(f'--{command}', dest='command', action='store_const', const=command,
+                             help=text)
     
     args = parser.parse_args()
     
+    if args.stats:
+        if not print_history_stats(args.history):
+            sys.exit(1)
+        return
+    
+    if args.simulate:
+        # stdout carries the decision records; messages go to stderr
+        out, sys.stdout = sys.stdout, sys.stderr
+    # A running instance owns the pointer: hand it the request and exit
+    elif attach_to_running(args):
+        return
+    if args.command:
+        print("Error: Move is not running")
+        sys.exit(1)
+    
+    if args.rescan:
+        capabilities.clear()
+    
+    if args.idle_source != 'auto':
+        try:
+            set_idle_source(open_idle_source(args.idle_source))
+        except IdleSourceUnavailable as e:
+            print(f"Error: idle source '{args.idle_source}' unavailable: {e}")
+            sys.exit(1)
+    
     jiggler = Move()
     
     # Load saved settings
@@ -330,16 +3556,128 @@ Examples:
     else:
         jiggler.circle_steps = settings['circle_steps']
     
+    jiggler.pattern = args.pattern if args.pattern is not None else settings['pattern']
+    jiggler.cycle_time = args.cycle_time if args.cycle_time is not None else settings['cycle_time']
+    try:
+        check_settings({'pattern': jiggler.pattern, 'circle_steps': jiggler.circle_steps,
+                        'circle_radius': jiggler.circle_radius, 'cycle_time': jiggler.cycle_time})
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
     if args.idle is not None:
         jiggler.idle_threshold = args.idle
     else:
         jiggler.idle_threshold = settings['idle_threshold']
     
-    # Disable pyautogui fail-safe for smoother operation
-    pyautogui.FAILSAFE = True
+    jiggler.engine = args.engine if args.engine is not None else settings['engine']
+    jiggler.probe_budget = settings['probe_budget']
+    jiggler.record_history = args.record or settings['record_history']
+    jiggler.power_policy = args.power_policy or settings['power_policy']
+    jiggler.battery_slack = settings['battery_slack']
+    jiggler.battery_pattern = settings['battery_pattern']
+    if jiggler.battery_pattern not in TRAJECTORIES:
+        print(f"Error: Unknown battery pattern '{jiggler.battery_pattern}'")
+        sys.exit(1)
+    jiggler.log_format = args.log_format or settings['log_format']
+    jiggler.indicator_name = args.indicator or settings['indicator']
+    jiggler.log.json_lines = jiggler.log_format == 'json'
+    
+    jiggler.lock_monitor_name = args.lock_monitor
+    if args.lock_poll is not None:
+        jiggler.lock_poll_seconds = args.lock_poll
+    else:
+        jiggler.lock_poll_seconds = settings['lock_poll_seconds']
+    
+    if args.simulate:
+        try:
+            run_simulation(args.simulate, jiggler, interval_minutes, interval_seconds, out)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+    
+    if args.sessions:
+        # Per-session entries override the settings resolved above
+        defaults = dict(settings, interval_minutes=interval_minutes, interval_seconds=interval_seconds,
+                        circle_radius=jiggler.circle_radius, circle_steps=jiggler.circle_steps,
+                        idle_threshold=jiggler.idle_threshold, pattern=jiggler.pattern,
+                        cycle_time=jiggler.cycle_time, lock_poll_seconds=jiggler.lock_poll_seconds)
+        if not run_daemon(args.sessions, defaults, log=jiggler.log):
+            sys.exit(1)
+        return
+    
+    try:
+        jiggler.lock_monitor = open_lock_monitor(jiggler.lock_monitor_name, jiggler.lock_poll_seconds)
+    except LockMonitorUnavailable as e:
+        print(f"Error: lock monitor '{args.lock_monitor}' unavailable: {e}")
+        sys.exit(1)
+    
+    try:
+        backend = open_input_backend(args.input_backend)
+    except InputBackendUnavailable as e:
+        print(f"Error: input backend '{args.input_backend}' unavailable: {e}")
+        sys.exit(1)
+    # Keep the fail-safe: moving the pointer to a corner stops the tool
+    backend.failsafe = True
+    set_input_backend(backend)
+    
+    # First idle check opens the idle source; report how long startup took
+    get_idle_time()
+    startup_ms = (time.perf_counter() - _STARTED) * 1000
+    source_name = _idle_source.name if _idle_source is not None else 'none'
+    print(f"Startup: first idle check after {startup_ms:.1f} ms "
+          f"(idle: {source_name}, input: {backend.name}, lock: {jiggler.lock_monitor.name})")
+    if startup_ms > STARTUP_BUDGET_MS:
+        print(f"Warning: startup exceeded the {STARTUP_BUDGET_MS} ms budget")
+    metrics.set('move_startup_seconds', startup_ms / 1000)
+    
+    try:
+        control = ControlServer(jiggler.control).start()
+    except ControlError as e:
+        # Two loops would fight over one pointer
+        print(f"Not starting: {e}")
+        jiggler.lock_monitor.stop()
+        sys.exit(1)
+    
+    server = stats_writer = None
+    if args.metrics_port is not None:
+        try:
+            server = start_metrics_server(args.metrics_port)
+            print(f"Metrics: http://127.0.0.1:{args.metrics_port}/metrics")
+        except OSError as e:
+            print(f"Warning: Could not start metrics server: {e}")
+    if args.stats_file:
+        stats_writer = StatsFileWriter(args.stats_file, args.stats_interval,
+                                       extra={'probes': probes.stats}, log=jiggler.log).start()
+    
+    # Edits to the settings file apply without a restart
+    watcher = open_settings_watcher(jiggler.settings_file, jiggler.reload_settings, log=jiggler.log)
+    recorder = None
+    if jiggler.record_history:
+        try:
+            recorder = ActivityRecorder(
+                args.history, on_battery=lambda: bool(jiggler.power and jiggler.power.on_battery)).start()
+            jiggler.add_listener(recorder.on_decision)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not open activity history: {e}")
     
     # Start the tool
-    jiggler.run(interval_minutes, interval_seconds, args.save)
+    try:
+        jiggler.run(interval_minutes, interval_seconds, args.save)
+    finally:
+        watcher.stop()
+        if recorder is not None:
+            recorder.close()
+        if control is not None:
+            control.close()
+        jiggler.log.close()
+        if server is not None:
+            server.shutdown()
+        if stats_writer is not None:
+            stats_writer.stop()
+        if args.profile:
+            print_profile()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1 @@
+"""Per-OS backends for move.py, imported lazily by move.platform_backends()"""
@@ -0,0 +1,364 @@
+"""
+macOS backends for move.py: IOKit, Quartz, IOPM, CGEvent, kqueue and osascript
+Imported by move.platform_backends() on macOS only; importing it registers
+the backends below.
+"""
+
+import os
+import functools
+
+from move import (IdleSource, IdleSourceUnavailable, register_idle_source,
+                  LockMonitor, LockMonitorUnavailable, register_lock_monitor,
+                  Inhibitor, InhibitorUnavailable, register_inhibitor,
+                  InputBackend, InputBackendUnavailable, register_input_backend,
+                  SettingsWatcherUnavailable, register_settings_watcher, _PipeSettingsWatcher,
+                  NotificationIndicator, IndicatorUnavailable, register_indicator)
+
+
+# ---------------------------------------------------------------------------
+# Idle sources
+# ---------------------------------------------------------------------------
+
+@register_idle_source
+class IOKitIdleSource(IdleSource):
+    """macOS HIDIdleTime read directly from the IOHIDSystem registry entry"""
+    name = 'iokit'
+    platforms = ('Darwin',)
+
+    def __init__(self):
+        import ctypes
+        try:
+            iokit = ctypes.CDLL('/System/Library/Frameworks/IOKit.framework/IOKit')
+            cf = ctypes.CDLL('/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation')
+        except OSError as e:
+            raise IdleSourceUnavailable(str(e))
+        iokit.IOServiceMatching.restype = ctypes.c_void_p
+        iokit.IOServiceMatching.argtypes = [ctypes.c_char_p]
+        iokit.IOServiceGetMatchingService.restype = ctypes.c_uint32
+        iokit.IOServiceGetMatchingService.argtypes = [ctypes.c_uint32, ctypes.c_void_p]
+        iokit.IORegistryEntryCreateCFProperty.restype = ctypes.c_void_p
+        iokit.IORegistryEntryCreateCFProperty.argtypes = [
+            ctypes.c_uint32, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint32]
+        iokit.IOObjectRelease.argtypes = [ctypes.c_uint32]
+        cf.CFStringCreateWithCString.restype = ctypes.c_void_p
+        cf.CFStringCreateWithCString.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint32]
+        cf.CFNumberGetValue.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p]
+        cf.CFRelease.argtypes = [ctypes.c_void_p]
+
+        # kIOMasterPortDefault is 0
+        self._service = iokit.IOServiceGetMatchingService(0, iokit.IOServiceMatching(b'IOHIDSystem'))
+        if not self._service:
+            raise IdleSourceUnavailable("IOHIDSystem service not found")
+        self._iokit, self._cf = iokit, cf
+        self._key = cf.CFStringCreateWithCString(None, b'HIDIdleTime', 0x08000100)
+        self._value = ctypes.c_int64()
+        self._value_ref = ctypes.byref(self._value)
+        self.idle_seconds()
+
+    def idle_seconds(self):
+        prop = self._iokit.IORegistryEntryCreateCFProperty(self._service, self._key, None, 0)
+        if not prop:
+            raise IdleSourceUnavailable("HIDIdleTime missing")
+        try:
+            # kCFNumberSInt64Type is 4
+            self._cf.CFNumberGetValue(prop, 4, self._value_ref)
+        finally:
+            self._cf.CFRelease(prop)
+        return self._value.value / 1000000000
+
+    def close(self):
+        if self._service:
+            self._cf.CFRelease(self._key)
+            self._iokit.IOObjectRelease(self._service)
+            self._service = 0
+
+
+# ---------------------------------------------------------------------------
+# Lock monitors
+# ---------------------------------------------------------------------------
+
+def quartz_session_locked():
+    """Read the lock state of the current macOS session in-process"""
+    import Quartz
+    session = Quartz.CGSessionCopyCurrentDictionary()
+    if session is None:
+        return True
+    return bool(session.get('CGSSessionScreenIsLocked', False))
+
+
+@register_lock_monitor
+class DarwinLockMonitor(LockMonitor):
+    """macOS ``com.apple.screenIsLocked``/``screenIsUnlocked`` distributed notifications"""
+    name = 'darwin'
+    platforms = ('Darwin',)
+
+    def __init__(self):
+        super().__init__()
+        try:
+            import Foundation  # noqa: F401 (PyObjC)
+            self.locked = quartz_session_locked()
+        except ImportError:
+            raise LockMonitorUnavailable("PyObjC is not installed")
+
+    def _watch(self):
+        import objc
+        from Foundation import NSDistributedNotificationCenter, NSObject, NSRunLoop, NSDate
+
+        monitor = self
+
+        class Observer(NSObject):
+            def locked_(self, notification):
+                monitor._set_locked(True)
+
+            def unlocked_(self, notification):
+                monitor._set_locked(False)
+
+        with objc.autorelease_pool():
+            observer = Observer.new()
+            center = NSDistributedNotificationCenter.defaultCenter()
+            center.addObserver_selector_name_object_(observer, 'locked:', 'com.apple.screenIsLocked', None)
+            center.addObserver_selector_name_object_(observer, 'unlocked:', 'com.apple.screenIsUnlocked', None)
+            run_loop = NSRunLoop.currentRunLoop()
+            while not self._stop.is_set():
+                # Blocks in the run loop until a notification (or the 60 s
+                # safety timeout) arrives; no polling of the session state
+                run_loop.runMode_beforeDate_('kCFRunLoopDefaultMode',
+                                             NSDate.dateWithTimeIntervalSinceNow_(60))
+            center.removeObserver_(observer)
+
+
+# ---------------------------------------------------------------------------
+# Inhibitors
+# ---------------------------------------------------------------------------
+
+@register_inhibitor
+class IOPMInhibitor(Inhibitor):
+    """macOS ``IOPMAssertionCreateWithName`` (PreventUserIdleDisplaySleep)"""
+    name = 'iopm'
+    platforms = ('Darwin',)
+
+    def __init__(self):
+        super().__init__()
+        import ctypes
+        try:
+            iokit = ctypes.CDLL('/System/Library/Frameworks/IOKit.framework/IOKit')
+            cf = ctypes.CDLL('/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation')
+        except OSError as e:
+            raise InhibitorUnavailable(str(e))
+        cf.CFStringCreateWithCString.restype = ctypes.c_void_p
+        cf.CFStringCreateWithCString.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint32]
+        iokit.IOPMAssertionCreateWithName.argtypes = [
+            ctypes.c_void_p, ctypes.c_uint32, ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint32)]
+        iokit.IOPMAssertionRelease.argtypes = [ctypes.c_uint32]
+        self._iokit = iokit
+        self._type = cf.CFStringCreateWithCString(None, b'PreventUserIdleDisplaySleep', 0x08000100)
+        self._name = cf.CFStringCreateWithCString(None, self.reason.encode(), 0x08000100)
+        self._id = ctypes.c_uint32()
+
+    def _acquire(self):
+        import ctypes
+        # kIOPMAssertionLevelOn is 255
+        if self._iokit.IOPMAssertionCreateWithName(self._type, 255, self._name, ctypes.byref(self._id)):
+            raise InhibitorUnavailable("IOPMAssertionCreateWithName failed")
+
+    def _release(self):
+        self._iokit.IOPMAssertionRelease(self._id.value)
+
+
+@register_inhibitor
+class CaffeinateInhibitor(Inhibitor):
+    """macOS fallback: one long-lived ``caffeinate`` child tied to our pid"""
+    name = 'caffeinate'
+    platforms = ('Darwin',)
+
+    def __init__(self):
+        super().__init__()
+        import shutil
+        if not shutil.which('caffeinate'):
+            raise InhibitorUnavailable("caffeinate not found")
+        self._process = None
+
+    def _acquire(self):
+        import subprocess
+        self._process = subprocess.Popen(['caffeinate', '-d', '-i', '-w', str(os.getpid())])
+
+    def _release(self):
+        process, self._process = self._process, None
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+# ---------------------------------------------------------------------------
+# Input backends
+# ---------------------------------------------------------------------------
+
+@register_input_backend
+class CGEventInputBackend(InputBackend):
+    """macOS Quartz ``CGEventPost`` mouse-moved events via ctypes"""
+    name = 'cgevent'
+    platforms = ('Darwin',)
+
+    def __init__(self):
+        import ctypes
+
+        class CGPoint(ctypes.Structure):
+            _fields_ = [('x', ctypes.c_double), ('y', ctypes.c_double)]
+
+        try:
+            cg = ctypes.CDLL('/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices')
+        except OSError as e:
+            raise InputBackendUnavailable(str(e))
+        cg.CGEventCreate.restype = ctypes.c_void_p
+        cg.CGEventCreate.argtypes = [ctypes.c_void_p]
+        cg.CGEventGetLocation.restype = CGPoint
+        cg.CGEventGetLocation.argtypes = [ctypes.c_void_p]
+        cg.CGEventCreateMouseEvent.restype = ctypes.c_void_p
+        cg.CGEventCreateMouseEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint32, CGPoint, ctypes.c_uint32]
+        cg.CGEventPost.argtypes = [ctypes.c_uint32, ctypes.c_void_p]
+        cg.CFRelease.argtypes = [ctypes.c_void_p]
+        cg.CGMainDisplayID.restype = ctypes.c_uint32
+        cg.CGDisplayPixelsWide.argtypes = cg.CGDisplayPixelsHigh.argtypes = [ctypes.c_uint32]
+        self._cg = cg
+        self._point = CGPoint
+
+    def position(self):
+        event = self._cg.CGEventCreate(None)
+        try:
+            point = self._cg.CGEventGetLocation(event)
+        finally:
+            self._cg.CFRelease(event)
+        return int(point.x), int(point.y)
+
+    def screen_size(self):
+        display = self._cg.CGMainDisplayID()
+        return self._cg.CGDisplayPixelsWide(display), self._cg.CGDisplayPixelsHigh(display)
+
+    def _move_to(self, x, y):
+        # kCGEventMouseMoved is 5, kCGHIDEventTap is 0
+        event = self._cg.CGEventCreateMouseEvent(None, 5, self._point(x, y), 0)
+        try:
+            self._cg.CGEventPost(0, event)
+        finally:
+            self._cg.CFRelease(event)
+
+
+# ---------------------------------------------------------------------------
+# Settings watcher
+# ---------------------------------------------------------------------------
+
+@register_settings_watcher
+class KqueueSettingsWatcher(_PipeSettingsWatcher):
+    """kqueue vnode events on the directory and the file itself (macOS/BSD)"""
+    name = 'kqueue'
+
+    def __init__(self, path, callback, log=None):
+        import select
+        if not hasattr(select, 'kqueue'):
+            raise SettingsWatcherUnavailable("kqueue not available")
+        super().__init__(path, callback, log)
+        self._flags = getattr(os, 'O_EVTONLY', os.O_RDONLY)
+        self._kq = select.kqueue()
+        self._dir_fd = os.open(os.path.dirname(os.path.abspath(self.path)), self._flags)
+        self._file_fd = None
+        self._kq.control([
+            select.kevent(self._wake_r, select.KQ_FILTER_READ, select.KQ_EV_ADD),
+            # Directory writes: entries created, renamed over or removed
+            select.kevent(self._dir_fd, select.KQ_FILTER_VNODE,
+                          select.KQ_EV_ADD | select.KQ_EV_CLEAR, select.KQ_NOTE_WRITE)], 0)
+        self._watch_file()
+
+    def _watch_file(self):
+        """(Re)attach to the current inode, which catches in-place writes"""
+        import select
+        if self._file_fd is not None:
+            os.close(self._file_fd)  # closing also drops its kevent
+            self._file_fd = None
+        try:
+            self._file_fd = os.open(self.path, self._flags)
+        except OSError:
+            return
+        self._kq.control([select.kevent(
+            self._file_fd, select.KQ_FILTER_VNODE, select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+            select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND | select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME)], 0)
+
+    def _wait(self):
+        events = self._kq.control(None, 8)
+        if any(event.ident == self._wake_r for event in events):
+            return False
+        self._watch_file()
+        return True
+
+    def _close_handles(self):
+        for fd in (self._file_fd, self._dir_fd):
+            if fd is not None:
+                os.close(fd)
+        self._kq.close()
+        super()._close_handles()
+
+
+# ---------------------------------------------------------------------------
+# Indicators
+# ---------------------------------------------------------------------------
+
+@register_indicator
+class OsascriptIndicator(NotificationIndicator):
+    """Notification Center banners through ``osascript``"""
+    name = 'osascript'
+
+    def __init__(self):
+        import shutil
+        if not shutil.which('osascript'):
+            raise IndicatorUnavailable("osascript not found")
+        super().__init__()
+
+    def notify(self, title, text):
+        import json
+        import subprocess
+        # JSON string literals are valid AppleScript ones for our plain text
+        script = f"display notification {json.dumps(text)} with title {json.dumps(title)}"
+        subprocess.run(['osascript', '-e', script],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
+
+
+# ---------------------------------------------------------------------------
+# Power
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=1)
+def _darwin_power_libraries():
+    import ctypes
+    iokit = ctypes.CDLL('/System/Library/Frameworks/IOKit.framework/IOKit')
+    cf = ctypes.CDLL('/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation')
+    iokit.IOPSCopyPowerSourcesInfo.restype = ctypes.c_void_p
+    iokit.IOPSGetProvidingPowerSourceType.restype = ctypes.c_void_p
+    iokit.IOPSGetProvidingPowerSourceType.argtypes = [ctypes.c_void_p]
+    cf.CFStringGetCString.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_long, ctypes.c_uint32]
+    cf.CFRelease.argtypes = [ctypes.c_void_p]
+    return iokit, cf
+
+
+def on_battery():
+    """True if the Mac is running on battery power"""
+    import ctypes
+    iokit, cf = _darwin_power_libraries()
+    blob = iokit.IOPSCopyPowerSourcesInfo()
+    if not blob:
+        return False
+    try:
+        # Not owned (Get rule), valid while the blob is
+        kind = iokit.IOPSGetProvidingPowerSourceType(blob)
+        name = ctypes.create_string_buffer(64)
+        if not kind or not cf.CFStringGetCString(kind, name, 64, 0x08000100):
+            return None
+        return name.value == b'Battery Power'
+    finally:
+        cf.CFRelease(blob)
+
+
+def set_timer_coalescing(enabled, slack):
+    """Move the calling thread to the utility QoS class, which coalesces its timers"""
+    import ctypes
+    # The kernel picks the slack for the class; 0x15 is the default class
+    libc = ctypes.CDLL('/usr/lib/libSystem.dylib')
+    libc.pthread_set_qos_class_self_np(0x11 if enabled else 0x15, 0)
@@ -0,0 +1,881 @@
+"""
+Linux backends for move.py: X11, D-Bus, evdev/uinput, inotify, sysfs and libnotify
+Imported by move.platform_backends() on Linux only; importing it registers
+the backends below.
+"""
+
+import os
+import time
+
+from move import (IdleSource, IdleSourceUnavailable, register_idle_source, ActivityListener,
+                  LockMonitor, LockMonitorUnavailable, register_lock_monitor,
+                  Inhibitor, InhibitorUnavailable, register_inhibitor,
+                  InputBackend, InputBackendUnavailable, register_input_backend,
+                  SettingsWatcherUnavailable, register_settings_watcher, _PipeSettingsWatcher,
+                  NotificationIndicator, IndicatorUnavailable, register_indicator)
+
+
+# ---------------------------------------------------------------------------
+# Shared libraries and X displays
+# ---------------------------------------------------------------------------
+
+# Stable sonames let us dlopen directly; ctypes.util.find_library forks
+# ldconfig/gcc to search, which is exactly the cost we are avoiding
+_SONAMES = {
+    'X11': 'libX11.so.6',
+    'Xext': 'libXext.so.6',
+    'Xss': 'libXss.so.1',
+    'Xtst': 'libXtst.so.6',
+    'Xi': 'libXi.so.6',
+}
+
+
+def load_library(name):
+    """Load a shared library by short name or raise IdleSourceUnavailable"""
+    import ctypes
+    if name in _SONAMES:
+        try:
+            return ctypes.CDLL(_SONAMES[name])
+        except OSError:
+            pass
+    import ctypes.util
+    path = ctypes.util.find_library(name)
+    if not path:
+        raise IdleSourceUnavailable(f"lib{name} not found")
+    return ctypes.CDLL(path)
+
+
+def open_x_display(name=None):
+    """Open the X display ``name`` (default $DISPLAY), returning (libX11, Display*)"""
+    import ctypes
+    if not (name or os.environ.get('DISPLAY')):
+        raise IdleSourceUnavailable("DISPLAY is not set")
+    xlib = load_library('X11')
+    xlib.XOpenDisplay.restype = ctypes.c_void_p
+    xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+    xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+    xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+    display = xlib.XOpenDisplay(name.encode() if name else None)
+    if not display:
+        raise IdleSourceUnavailable(f"cannot open X display {name or os.environ['DISPLAY']}")
+    return xlib, display
+
+
+# ---------------------------------------------------------------------------
+# Idle sources
+# ---------------------------------------------------------------------------
+
+@register_idle_source
+class XScreenSaverIdleSource(IdleSource):
+    """X11 idle time via the MIT-SCREEN-SAVER extension (libXss)"""
+    name = 'xss'
+    platforms = ('Linux',)
+    screensaver_on = False  # state reported by the last query
+
+    def __init__(self, display=None):
+        import ctypes
+
+        class XScreenSaverInfo(ctypes.Structure):
+            _fields_ = [('window', ctypes.c_ulong),
+                        ('state', ctypes.c_int),
+                        ('kind', ctypes.c_int),
+                        ('til_or_since', ctypes.c_ulong),
+                        ('idle', ctypes.c_ulong),
+                        ('eventMask', ctypes.c_ulong)]
+
+        self._xlib, self._display = open_x_display(display)
+        try:
+            xss = load_library('Xss')
+        except IdleSourceUnavailable:
+            self.close()
+            raise
+        xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(XScreenSaverInfo)
+        xss.XScreenSaverQueryInfo.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XScreenSaverInfo)]
+        self._xss = xss
+        self._root = self._xlib.XDefaultRootWindow(self._display)
+        self._info = xss.XScreenSaverAllocInfo()
+        if not self._info:
+            self.close()
+            raise IdleSourceUnavailable("XScreenSaverAllocInfo failed")
+        self.idle_seconds()
+
+    def idle_seconds(self):
+        if not self._xss.XScreenSaverQueryInfo(self._display, self._root, self._info):
+            raise IdleSourceUnavailable("MIT-SCREEN-SAVER extension missing")
+        info = self._info.contents
+        self.screensaver_on = info.state == 1  # ScreenSaverOn
+        return info.idle / 1000.0
+
+    def close(self):
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+@register_idle_source
+class XSyncIdleSource(IdleSource):
+    """X11 idle time from the XSync IDLETIME system counter (libXext)"""
+    name = 'xsync'
+    platforms = ('Linux',)
+
+    def __init__(self, display=None):
+        import ctypes
+
+        class XSyncValue(ctypes.Structure):
+            _fields_ = [('hi', ctypes.c_int), ('lo', ctypes.c_uint)]
+
+        class XSyncSystemCounter(ctypes.Structure):
+            _fields_ = [('name', ctypes.c_char_p),
+                        ('counter', ctypes.c_ulong),
+                        ('resolution', XSyncValue)]
+
+        if not (display or os.environ.get('DISPLAY')):
+            raise IdleSourceUnavailable("DISPLAY is not set")
+        xext = load_library('Xext')
+        xext.XSyncQueryExtension.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        xext.XSyncInitialize.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        xext.XSyncListSystemCounters.restype = ctypes.POINTER(XSyncSystemCounter)
+        xext.XSyncListSystemCounters.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        xext.XSyncFreeSystemCounterList.argtypes = [ctypes.POINTER(XSyncSystemCounter)]
+        xext.XSyncQueryCounter.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XSyncValue)]
+
+        self._xlib, self._display = open_x_display(display)
+        self._xext = xext
+        a, b = ctypes.c_int(), ctypes.c_int()
+        if not (xext.XSyncQueryExtension(self._display, ctypes.byref(a), ctypes.byref(b))
+                and xext.XSyncInitialize(self._display, ctypes.byref(a), ctypes.byref(b))):
+            self.close()
+            raise IdleSourceUnavailable("SYNC extension missing")
+
+        count = ctypes.c_int()
+        counters = xext.XSyncListSystemCounters(self._display, ctypes.byref(count))
+        self._counter = None
+        for i in range(count.value):
+            if counters[i].name == b'IDLETIME':
+                self._counter = counters[i].counter
+                break
+        if counters:
+            xext.XSyncFreeSystemCounterList(counters)
+        if self._counter is None:
+            self.close()
+            raise IdleSourceUnavailable("no IDLETIME counter")
+        self._value = XSyncValue()
+        self._value_ref = ctypes.byref(self._value)
+
+    def idle_seconds(self):
+        if not self._xext.XSyncQueryCounter(self._display, self._counter, self._value_ref):
+            raise IdleSourceUnavailable("XSyncQueryCounter failed")
+        return ((self._value.hi << 32) | self._value.lo) / 1000.0
+
+    def close(self):
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+class _DBusIdleSource(IdleSource):
+    """Idle time from a D-Bus method returning milliseconds (needs jeepney)"""
+    platforms = ('Linux',)
+    blocking = True
+    bus_name = object_path = interface = method = None
+
+    def __init__(self):
+        try:
+            from jeepney import DBusAddress, new_method_call
+            from jeepney.io.blocking import open_dbus_connection
+        except ImportError:
+            raise IdleSourceUnavailable("jeepney is not installed")
+        try:
+            self._conn = open_dbus_connection(bus='SESSION')
+        except Exception as e:
+            raise IdleSourceUnavailable(f"no session bus: {e}")
+        address = DBusAddress(self.object_path, bus_name=self.bus_name,
+                              interface=self.interface)
+        self._message = lambda: new_method_call(address, self.method)
+        try:
+            self.idle_seconds()
+        except Exception as e:
+            self.close()
+            raise IdleSourceUnavailable(f"{self.bus_name}: {e}")
+
+    def idle_seconds(self):
+        reply = self._conn.send_and_get_reply(self._message(), timeout=1)
+        return reply.body[0] / 1000.0
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+@register_idle_source
+class MutterIdleSource(_DBusIdleSource):
+    """GNOME Shell (X11 and Wayland) idle monitor"""
+    name = 'mutter'
+    bus_name = 'org.gnome.Mutter.IdleMonitor'
+    object_path = '/org/gnome/Mutter/IdleMonitor/Core'
+    interface = 'org.gnome.Mutter.IdleMonitor'
+    method = 'GetIdletime'
+
+
+@register_idle_source
+class FreedesktopIdleSource(_DBusIdleSource):
+    """org.freedesktop.ScreenSaver idle time (KDE Plasma and others)"""
+    name = 'freedesktop'
+    bus_name = 'org.freedesktop.ScreenSaver'
+    object_path = '/org/freedesktop/ScreenSaver'
+    interface = 'org.freedesktop.ScreenSaver'
+    method = 'GetSessionIdleTime'
+
+
+@register_idle_source
+class EvdevActivityListener(ActivityListener):
+    """Activity from ``/dev/input/event*`` keyboards, mice and touchpads
+
+    Needs read access to the devices (the ``input`` group on most distros).
+    Our own uinput device is skipped by name.
+    """
+    name = 'evdev'
+    platforms = ('Linux',)
+    # Seconds between checks for hot-plugged devices while nothing happens
+    rescan_interval = 60
+    EV_KEY, EV_REL = 0x01, 0x02
+
+    def __init__(self, clock=time.monotonic):
+        super().__init__(clock)
+        import select
+        self._poll = select.poll()
+        self._devices = {}
+        self._dir_mtime = None
+        self._scan()
+        if not self._devices:
+            raise IdleSourceUnavailable("no readable keyboard/mouse in /dev/input")
+        self.start()
+
+    def _prepare(self):
+        import select
+        # The device fds were registered by _scan(); add the wake pipe too
+        self._poll.register(self._wake_r, select.POLLIN)
+
+    @staticmethod
+    def _ioc_read(nr, size):
+        # _IOC(_IOC_READ, 'E', nr, size)
+        return 0x80000000 | (size << 16) | (ord('E') << 8) | nr
+
+    def _scan(self):
+        """Open any new input devices that report keys or relative motion"""
+        import fcntl
+        import glob
+        import select
+        try:
+            mtime = os.stat('/dev/input').st_mtime
+        except OSError as e:
+            raise IdleSourceUnavailable(str(e))
+        if mtime == self._dir_mtime:
+            return
+        self._dir_mtime = mtime
+        known = {path for path, _ in self._devices.values()}
+        for path in glob.glob('/dev/input/event*'):
+            if path in known:
+                continue
+            try:
+                fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            except OSError:
+                continue
+            try:
+                name = bytearray(256)
+                fcntl.ioctl(fd, self._ioc_read(0x06, len(name)), name)  # EVIOCGNAME
+                types = bytearray(4)
+                fcntl.ioctl(fd, self._ioc_read(0x20, len(types)), types)  # EVIOCGBIT(0)
+            except OSError:
+                os.close(fd)
+                continue
+            wanted = types[0] & ((1 << self.EV_KEY) | (1 << self.EV_REL))
+            if not wanted or bytes(name).rstrip(b'\0') == UInputBackend.DEVICE_NAME:
+                os.close(fd)
+                continue
+            self._devices[fd] = (path, name)
+            self._poll.register(fd, select.POLLIN)
+
+    def _wait_for_input(self):
+        ready = self._poll.poll(self.rescan_interval * 1000)
+        if not ready:
+            self._scan()
+            return False
+        active = False
+        for fd, _ in ready:
+            if fd == self._wake_r:
+                return False
+            try:
+                # Drain the whole burst; content does not matter, only that it happened
+                while os.read(fd, 4096):
+                    active = True
+            except BlockingIOError:
+                pass
+            except OSError:
+                # Device unplugged; rescan on the next quiet period
+                self._poll.unregister(fd)
+                self._devices.pop(fd, None)
+                os.close(fd)
+                self._dir_mtime = None
+        return active
+
+    def _close_handles(self):
+        for fd in list(self._devices):
+            os.close(fd)
+        self._devices.clear()
+
+
+@register_idle_source
+class XInput2ActivityListener(ActivityListener):
+    """Activity from XInput2 raw key, button and motion events on X11
+
+    Events from XTEST devices (what XTestInputBackend injects) are ignored.
+    """
+    name = 'xinput2'
+    platforms = ('Linux',)
+    XI_RawKeyPress, XI_RawButtonPress, XI_RawMotion = 13, 15, 17
+    GenericEvent = 35
+
+    def __init__(self, clock=time.monotonic):
+        import ctypes
+        super().__init__(clock)
+
+        class XIEventMask(ctypes.Structure):
+            _fields_ = [('deviceid', ctypes.c_int), ('mask_len', ctypes.c_int),
+                        ('mask', ctypes.POINTER(ctypes.c_ubyte))]
+
+        class XIDeviceInfo(ctypes.Structure):
+            _fields_ = [('deviceid', ctypes.c_int), ('name', ctypes.c_char_p),
+                        ('use', ctypes.c_int), ('attachment', ctypes.c_int),
+                        ('enabled', ctypes.c_int), ('num_classes', ctypes.c_int),
+                        ('classes', ctypes.c_void_p)]
+
+        class XGenericEventCookie(ctypes.Structure):
+            _fields_ = [('type', ctypes.c_int), ('serial', ctypes.c_ulong),
+                        ('send_event', ctypes.c_int), ('display', ctypes.c_void_p),
+                        ('extension', ctypes.c_int), ('evtype', ctypes.c_int),
+                        ('cookie', ctypes.c_uint), ('data', ctypes.c_void_p)]
+
+        class XIRawEvent(ctypes.Structure):
+            _fields_ = [('type', ctypes.c_int), ('serial', ctypes.c_ulong),
+                        ('send_event', ctypes.c_int), ('display', ctypes.c_void_p),
+                        ('extension', ctypes.c_int), ('evtype', ctypes.c_int),
+                        ('time', ctypes.c_ulong), ('deviceid', ctypes.c_int),
+                        ('sourceid', ctypes.c_int)]
+
+        class XEvent(ctypes.Union):
+            _fields_ = [('cookie', XGenericEventCookie), ('pad', ctypes.c_long * 24)]
+
+        self._xlib, self._display = open_x_display()
+        try:
+            xi = load_library('Xi')
+        except IdleSourceUnavailable:
+            self._close_handles()
+            raise
+        xlib = self._xlib
+        xlib.XQueryExtension.argtypes = [ctypes.c_void_p, ctypes.c_char_p] + [ctypes.POINTER(ctypes.c_int)] * 3
+        xlib.XConnectionNumber.argtypes = [ctypes.c_void_p]
+        xlib.XPending.argtypes = [ctypes.c_void_p]
+        xlib.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.POINTER(XEvent)]
+        xlib.XGetEventData.argtypes = [ctypes.c_void_p, ctypes.POINTER(XGenericEventCookie)]
+        xlib.XFreeEventData.argtypes = [ctypes.c_void_p, ctypes.POINTER(XGenericEventCookie)]
+        xlib.XFlush.argtypes = [ctypes.c_void_p]
+        xi.XIQueryDevice.restype = ctypes.POINTER(XIDeviceInfo)
+        xi.XIQueryDevice.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
+        xi.XIFreeDeviceInfo.argtypes = [ctypes.POINTER(XIDeviceInfo)]
+        xi.XISelectEvents.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XIEventMask), ctypes.c_int]
+
+        opcode, event, error = ctypes.c_int(), ctypes.c_int(), ctypes.c_int()
+        if not xlib.XQueryExtension(self._display, b'XInputExtension',
+                                    ctypes.byref(opcode), ctypes.byref(event), ctypes.byref(error)):
+            self._close_handles()
+            raise IdleSourceUnavailable("XInput extension missing")
+        self._opcode = opcode.value
+
+        # Slave devices named "... XTEST ..." carry injected events
+        count = ctypes.c_int()
+        devices = xi.XIQueryDevice(self._display, 0, ctypes.byref(count))  # XIAllDevices
+        self._ignored = {devices[i].deviceid for i in range(count.value)
+                         if b'XTEST' in (devices[i].name or b'')}
+        xi.XIFreeDeviceInfo(devices)
+
+        bits = (1 << self.XI_RawKeyPress) | (1 << self.XI_RawButtonPress) | (1 << self.XI_RawMotion)
+        mask_bytes = (ctypes.c_ubyte * 3)(*bits.to_bytes(3, 'little'))
+        mask = XIEventMask(1, 3, mask_bytes)  # XIAllMasterDevices
+        xi.XISelectEvents(self._display, xlib.XDefaultRootWindow(self._display), ctypes.byref(mask), 1)
+        xlib.XFlush(self._display)
+
+        self._fd = xlib.XConnectionNumber(self._display)
+        self._event = XEvent()
+        self._raw_type = ctypes.POINTER(XIRawEvent)
+        self._cast = ctypes.cast
+        self.start()
+
+    def _wait_for_input(self):
+        import select
+        xlib, display = self._xlib, self._display
+        if not xlib.XPending(display):
+            ready, _, _ = select.select([self._fd, self._wake_r], [], [])
+            if self._wake_r in ready:
+                return False
+        active = False
+        event = self._event
+        cookie = event.cookie
+        while xlib.XPending(display):
+            xlib.XNextEvent(display, event)
+            if cookie.type != self.GenericEvent or cookie.extension != self._opcode:
+                continue
+            if xlib.XGetEventData(display, cookie):
+                try:
+                    raw = self._cast(cookie.data, self._raw_type).contents
+                    if raw.sourceid not in self._ignored:
+                        active = True
+                finally:
+                    xlib.XFreeEventData(display, cookie)
+        return active
+
+    def _close_handles(self):
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+# ---------------------------------------------------------------------------
+# Lock monitors
+# ---------------------------------------------------------------------------
+
+class _DBusSignalLockMonitor(LockMonitor):
+    """Lock monitor fed by a D-Bus signal (needs jeepney)"""
+    platforms = ('Linux',)
+    bus = 'SESSION'
+
+    def __init__(self):
+        super().__init__()
+        try:
+            from jeepney.io.blocking import open_dbus_connection
+        except ImportError:
+            raise LockMonitorUnavailable("jeepney is not installed")
+        try:
+            self._conn = open_dbus_connection(bus=self.bus)
+            self.locked = self._query()
+        except LockMonitorUnavailable:
+            self.stop()
+            raise
+        except Exception as e:
+            self.stop()
+            raise LockMonitorUnavailable(f"{self.name}: {e}")
+
+    def _send(self, message):
+        from jeepney import MessageType
+        reply = self._conn.send_and_get_reply(message, timeout=2)
+        if reply.header.message_type == MessageType.error:
+            raise LockMonitorUnavailable(f"{self.name}: {reply.body}")
+        return reply.body
+
+    def _call(self, address, method, signature=None, body=()):
+        from jeepney import new_method_call
+        return self._send(new_method_call(address, method, signature, body))
+
+    def _query(self):
+        """Return the current lock state"""
+        raise NotImplementedError
+
+    def _match_rule(self):
+        raise NotImplementedError
+
+    def _handle(self, message):
+        raise NotImplementedError
+
+    def _watch(self):
+        from jeepney.bus_messages import message_bus
+        rule = self._match_rule()
+        try:
+            self._conn.send_and_get_reply(message_bus.AddMatch(rule), timeout=2)
+            with self._conn.filter(rule) as queue:
+                while not self._stop.is_set():
+                    self._handle(self._conn.recv_until_filtered(queue))
+        except Exception as e:
+            # Connection closed by stop() or the bus went away
+            self.error = e
+
+    def stop(self):
+        super().stop()
+        conn, self._conn = getattr(self, '_conn', None), None
+        if conn is not None:
+            conn.close()
+
+
+@register_lock_monitor
+class LogindLockMonitor(_DBusSignalLockMonitor):
+    """systemd-logind session ``LockedHint`` property"""
+    name = 'logind'
+    bus = 'SYSTEM'
+
+    def _query(self):
+        from jeepney import DBusAddress, Properties
+        manager = DBusAddress('/org/freedesktop/login1', bus_name='org.freedesktop.login1',
+                              interface='org.freedesktop.login1.Manager')
+        session_id = os.environ.get('XDG_SESSION_ID', 'auto')
+        self._session_path = self._call(manager, 'GetSession', 's', (session_id,))[0]
+        self._session = DBusAddress(self._session_path, bus_name='org.freedesktop.login1',
+                                    interface='org.freedesktop.login1.Session')
+        return bool(self._send(Properties(self._session).get('LockedHint'))[0][1])
+
+    def _match_rule(self):
+        from jeepney import MatchRule
+        return MatchRule(type='signal', interface='org.freedesktop.DBus.Properties',
+                         member='PropertiesChanged', path=self._session_path)
+
+    def _handle(self, message):
+        _, changed, invalidated = message.body
+        if 'LockedHint' in changed:
+            self._set_locked(changed['LockedHint'][1])
+        elif 'LockedHint' in invalidated:
+            self._set_locked(self._query())
+
+
+@register_lock_monitor
+class ScreenSaverLockMonitor(_DBusSignalLockMonitor):
+    """org.freedesktop.ScreenSaver ``ActiveChanged`` signal (KDE, Xfce, ...)"""
+    name = 'screensaver'
+    bus_name = 'org.freedesktop.ScreenSaver'
+    object_path = '/org/freedesktop/ScreenSaver'
+    interface = 'org.freedesktop.ScreenSaver'
+
+    def _query(self):
+        from jeepney import DBusAddress
+        address = DBusAddress(self.object_path, bus_name=self.bus_name, interface=self.interface)
+        return bool(self._call(address, 'GetActive')[0])
+
+    def _match_rule(self):
+        from jeepney import MatchRule
+        return MatchRule(type='signal', interface=self.interface, member='ActiveChanged')
+
+    def _handle(self, message):
+        self._set_locked(message.body[0])
+
+
+@register_lock_monitor
+class GnomeScreenSaverLockMonitor(ScreenSaverLockMonitor):
+    """GNOME Shell's org.gnome.ScreenSaver ``ActiveChanged`` signal"""
+    name = 'gnome-screensaver'
+    bus_name = 'org.gnome.ScreenSaver'
+    object_path = '/org/gnome/ScreenSaver'
+    interface = 'org.gnome.ScreenSaver'
+
+
+# ---------------------------------------------------------------------------
+# Inhibitors
+# ---------------------------------------------------------------------------
+
+@register_inhibitor
+class LogindInhibitor(Inhibitor):
+    """systemd-logind ``Inhibit('idle:sleep')``, held as a file descriptor"""
+    name = 'logind'
+    platforms = ('Linux',)
+
+    def __init__(self):
+        super().__init__()
+        try:
+            from jeepney.io.blocking import open_dbus_connection
+        except ImportError:
+            raise InhibitorUnavailable("jeepney is not installed")
+        try:
+            self._conn = open_dbus_connection(bus='SYSTEM', enable_fds=True)
+        except Exception as e:
+            raise InhibitorUnavailable(f"no system bus: {e}")
+        self._fd = None
+
+    def _acquire(self):
+        from jeepney import DBusAddress, new_method_call
+        manager = DBusAddress('/org/freedesktop/login1', bus_name='org.freedesktop.login1',
+                              interface='org.freedesktop.login1.Manager')
+        message = new_method_call(manager, 'Inhibit', 'ssss',
+                                  ('idle:sleep', 'move', self.reason, 'block'))
+        self._fd = self._conn.send_and_get_reply(message, timeout=2, unwrap=True)[0]
+
+    def _release(self):
+        # logind drops the inhibitor when the last copy of the fd is closed
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            fd.close()
+
+    def close(self):
+        super().close()
+        self._conn.close()
+
+
+@register_inhibitor
+class ScreenSaverInhibitor(Inhibitor):
+    """``org.freedesktop.ScreenSaver.Inhibit``, held by cookie on an open connection"""
+    name = 'screensaver'
+    platforms = ('Linux',)
+
+    def __init__(self):
+        super().__init__()
+        try:
+            from jeepney import DBusAddress
+            from jeepney.io.blocking import open_dbus_connection
+        except ImportError:
+            raise InhibitorUnavailable("jeepney is not installed")
+        try:
+            self._conn = open_dbus_connection(bus='SESSION')
+        except Exception as e:
+            raise InhibitorUnavailable(f"no session bus: {e}")
+        self._address = DBusAddress('/org/freedesktop/ScreenSaver',
+                                    bus_name='org.freedesktop.ScreenSaver',
+                                    interface='org.freedesktop.ScreenSaver')
+        self._cookie = None
+
+    def _acquire(self):
+        from jeepney import new_method_call
+        message = new_method_call(self._address, 'Inhibit', 'ss', ('move', self.reason))
+        self._cookie = self._conn.send_and_get_reply(message, timeout=2, unwrap=True)[0]
+
+    def _release(self):
+        from jeepney import new_method_call
+        cookie, self._cookie = self._cookie, None
+        if cookie is not None:
+            self._conn.send_and_get_reply(
+                new_method_call(self._address, 'UnInhibit', 'u', (cookie,)), timeout=2)
+
+    def close(self):
+        super().close()
+        self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Input backends
+# ---------------------------------------------------------------------------
+
+@register_input_backend
+class XTestInputBackend(InputBackend):
+    """X11 XTest fake motion events via ctypes (libX11 + libXtst)"""
+    name = 'xtest'
+    platforms = ('Linux',)
+
+    def __init__(self, display=None):
+        import ctypes
+        try:
+            self._xlib, self._display = open_x_display(display)
+        except IdleSourceUnavailable as e:
+            raise InputBackendUnavailable(str(e))
+        try:
+            xtst = load_library('Xtst')
+        except IdleSourceUnavailable as e:
+            self.close()
+            raise InputBackendUnavailable(str(e))
+        xlib = self._xlib
+        xtst.XTestFakeMotionEvent.argtypes = [
+            ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+        xlib.XFlush.argtypes = [ctypes.c_void_p]
+        xlib.XQueryPointer.argtypes = [ctypes.c_void_p, ctypes.c_ulong] + \
+            [ctypes.POINTER(ctypes.c_ulong)] * 2 + [ctypes.POINTER(ctypes.c_int)] * 4 + \
+            [ctypes.POINTER(ctypes.c_uint)]
+        xlib.XDisplayWidth.argtypes = xlib.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        self._xtst = xtst
+        self._root = xlib.XDefaultRootWindow(self._display)
+        screen = xlib.XDefaultScreen(self._display)
+        self._size = (xlib.XDisplayWidth(self._display, screen),
+                      xlib.XDisplayHeight(self._display, screen))
+        self._windows = (ctypes.c_ulong(), ctypes.c_ulong())
+        self._coords = tuple(ctypes.c_int() for _ in range(4))
+        self._mask = ctypes.c_uint()
+        self._query_args = [ctypes.byref(v) for v in self._windows + self._coords + (self._mask,)]
+
+    def position(self):
+        self._xlib.XQueryPointer(self._display, self._root, *self._query_args)
+        return self._coords[0].value, self._coords[1].value
+
+    def screen_size(self):
+        return self._size
+
+    def _move_to(self, x, y):
+        # screen -1 means "the screen the pointer is on"
+        self._xtst.XTestFakeMotionEvent(self._display, -1, x, y, 0)
+        self._xlib.XFlush(self._display)
+
+    def close(self):
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+@register_input_backend
+class UInputBackend(InputBackend):
+    """Virtual relative mouse on ``/dev/uinput`` (Linux consoles and Wayland)
+
+    A relative device cannot read the real pointer, so positions are tracked
+    virtually: paths are walked as deltas and always return to their start.
+    """
+    name = 'uinput'
+    platforms = ('Linux',)
+    failsafe = False
+
+    UI_SET_EVBIT = 0x40045564
+    UI_SET_KEYBIT = 0x40045565
+    UI_SET_RELBIT = 0x40045566
+    UI_DEV_CREATE = 0x5501
+    UI_DEV_DESTROY = 0x5502
+    EV_SYN, EV_KEY, EV_REL = 0x00, 0x01, 0x02
+    REL_X, REL_Y, BTN_LEFT = 0x00, 0x01, 0x110
+    BUS_VIRTUAL = 0x06
+    DEVICE_NAME = b'move-virtual-pointer'
+
+    def __init__(self):
+        import fcntl
+        import struct
+        try:
+            self._fd = os.open('/dev/uinput', os.O_WRONLY | os.O_NONBLOCK)
+        except OSError as e:
+            raise InputBackendUnavailable(f"/dev/uinput: {e}")
+        try:
+            fcntl.ioctl(self._fd, self.UI_SET_EVBIT, self.EV_KEY)
+            fcntl.ioctl(self._fd, self.UI_SET_KEYBIT, self.BTN_LEFT)
+            fcntl.ioctl(self._fd, self.UI_SET_EVBIT, self.EV_REL)
+            fcntl.ioctl(self._fd, self.UI_SET_RELBIT, self.REL_X)
+            fcntl.ioctl(self._fd, self.UI_SET_RELBIT, self.REL_Y)
+            # struct uinput_user_dev: name, input_id, ff_effects_max, 4 x abs[64]
+            os.write(self._fd, struct.pack('80sHHHHI', self.DEVICE_NAME, self.BUS_VIRTUAL, 1, 1, 1, 0)
+                     + bytes(4 * 64 * 4))
+            fcntl.ioctl(self._fd, self.UI_DEV_CREATE)
+        except OSError as e:
+            os.close(self._fd)
+            raise InputBackendUnavailable(f"uinput setup failed: {e}")
+        self._event = struct.Struct('llHHi')
+        self._position = (0, 0)
+
+    def position(self):
+        return self._position
+
+    def screen_size(self):
+        return (0, 0)
+
+    def _move_to(self, x, y):
+        dx, dy = x - self._position[0], y - self._position[1]
+        pack = self._event.pack
+        # All three events in one write: REL_X, REL_Y, SYN_REPORT
+        os.write(self._fd, pack(0, 0, self.EV_REL, self.REL_X, dx)
+                 + pack(0, 0, self.EV_REL, self.REL_Y, dy)
+                 + pack(0, 0, self.EV_SYN, 0, 0))
+        self._position = (x, y)
+
+    def close(self):
+        if self._fd is not None:
+            import fcntl
+            fcntl.ioctl(self._fd, self.UI_DEV_DESTROY)
+            os.close(self._fd)
+            self._fd = None
+
+
+# ---------------------------------------------------------------------------
+# Settings watcher
+# ---------------------------------------------------------------------------
+
+@register_settings_watcher
+class InotifySettingsWatcher(_PipeSettingsWatcher):
+    """Linux inotify on the settings file's directory (libc via ctypes)"""
+    name = 'inotify'
+    # IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    MASK = 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+
+    def __init__(self, path, callback, log=None):
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise SettingsWatcherUnavailable("inotify not available")
+        fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if fd < 0:
+            raise SettingsWatcherUnavailable(os.strerror(ctypes.get_errno()))
+        if libc.inotify_add_watch(fd, os.fsencode(os.path.dirname(os.path.abspath(path))), self.MASK) < 0:
+            os.close(fd)
+            raise SettingsWatcherUnavailable(os.strerror(ctypes.get_errno()))
+        self._fd = fd
+        super().__init__(path, callback, log)
+
+    def _wait(self):
+        import select
+        import struct
+        name = os.fsencode(os.path.basename(self.path))
+        while True:
+            ready, _, _ = select.select([self._fd, self._wake_r], [], [])
+            if self._wake_r in ready:
+                return False
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                continue
+            # struct inotify_event: wd, mask, cookie, len, then a padded name
+            offset = 0
+            while offset + 16 <= len(data):
+                length = struct.unpack_from('iIII', data, offset)[3]
+                if data[offset + 16:offset + 16 + length].rstrip(b'\0') == name:
+                    return True
+                offset += 16 + length
+
+    def _close_handles(self):
+        os.close(self._fd)
+        super()._close_handles()
+
+
+# ---------------------------------------------------------------------------
+# Indicators
+# ---------------------------------------------------------------------------
+
+@register_indicator
+class NotifySendIndicator(NotificationIndicator):
+    """Desktop notifications through ``notify-send`` (libnotify)"""
+    name = 'notify-send'
+
+    def __init__(self):
+        import shutil
+        if not shutil.which('notify-send'):
+            raise IndicatorUnavailable("notify-send not found")
+        super().__init__()
+
+    def notify(self, title, text):
+        import subprocess
+        # The hint makes servers that support it replace our previous bubble
+        subprocess.run(['notify-send', '-a', 'Move', '-t', '4000',
+                        '-h', 'string:x-canonical-private-synchronous:move', title, text],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
+
+
+# ---------------------------------------------------------------------------
+# Power
+# ---------------------------------------------------------------------------
+
+def on_battery():
+    """True if a system battery is discharging and no mains/USB supply is online"""
+    base = '/sys/class/power_supply'
+    discharging = False
+    for name in os.listdir(base):
+        def read(attribute):
+            try:
+                with open(f'{base}/{name}/{attribute}', 'r') as f:
+                    return f.read().strip()
+            except OSError:
+                return ''
+        kind = read('type')
+        if kind == 'Battery':
+            # Batteries of mice and headsets report scope "Device"
+            if read('scope') != 'Device' and read('status') == 'Discharging':
+                discharging = True
+        elif read('online') == '1':
+            return False  # Mains/USB supply online
+    return discharging
+
+
+def set_timer_coalescing(enabled, slack):
+    """Set the calling thread's timer slack to ``slack`` seconds (or the default)"""
+    import ctypes
+    # PR_SET_TIMERSLACK is 29; 0 restores the default slack
+    slack_ns = int(slack * 1e9) if enabled else 0
+    ctypes.CDLL(None).prctl(29, ctypes.c_ulong(slack_ns), 0, 0, 0)
@@ -0,0 +1,234 @@
+"""
+Windows backends for move.py: GetLastInputInfo, SetThreadExecutionState,
+SendInput and ReadDirectoryChangesW
+Imported by move.platform_backends() on Windows only; importing it registers
+the backends below.
+"""
+
+import os
+
+from move import (IdleSource, IdleSourceUnavailable, register_idle_source,
+                  Inhibitor, InhibitorUnavailable, register_inhibitor,
+                  InputBackend, register_input_backend,
+                  SettingsWatcher, SettingsWatcherUnavailable, register_settings_watcher)
+
+
+# ---------------------------------------------------------------------------
+# Idle sources
+# ---------------------------------------------------------------------------
+
+@register_idle_source
+class WindowsIdleSource(IdleSource):
+    """Windows idle time from GetLastInputInfo"""
+    name = 'win32'
+    platforms = ('Windows',)
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [('cbSize', wintypes.UINT), ('dwTime', wintypes.DWORD)]
+
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._kernel32.GetTickCount.restype = wintypes.DWORD
+        self._info = LASTINPUTINFO()
+        self._info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        self._info_ref = ctypes.byref(self._info)
+
+    def idle_seconds(self):
+        if not self._user32.GetLastInputInfo(self._info_ref):
+            raise IdleSourceUnavailable("GetLastInputInfo failed")
+        # Both values are 32-bit tick counts that wrap every ~49.7 days
+        return ((self._kernel32.GetTickCount() - self._info.dwTime) & 0xFFFFFFFF) / 1000.0
+
+
+# ---------------------------------------------------------------------------
+# Inhibitors
+# ---------------------------------------------------------------------------
+
+@register_inhibitor
+class WindowsInhibitor(Inhibitor):
+    """Windows ``SetThreadExecutionState``
+
+    The state is per thread, so acquire/release must run on the loop thread.
+    """
+    name = 'win32'
+    platforms = ('Windows',)
+    ES_CONTINUOUS = 0x80000000
+    ES_SYSTEM_REQUIRED = 0x00000001
+    ES_DISPLAY_REQUIRED = 0x00000002
+
+    def __init__(self):
+        super().__init__()
+        import ctypes
+        self._kernel32 = ctypes.windll.kernel32
+        self._kernel32.SetThreadExecutionState.restype = ctypes.c_uint32
+        self._kernel32.SetThreadExecutionState.argtypes = [ctypes.c_uint32]
+
+    def _acquire(self):
+        flags = self.ES_CONTINUOUS | self.ES_SYSTEM_REQUIRED | self.ES_DISPLAY_REQUIRED
+        if not self._kernel32.SetThreadExecutionState(flags):
+            raise InhibitorUnavailable("SetThreadExecutionState failed")
+
+    def _release(self):
+        self._kernel32.SetThreadExecutionState(self.ES_CONTINUOUS)
+
+
+# ---------------------------------------------------------------------------
+# Input backends
+# ---------------------------------------------------------------------------
+
+@register_input_backend
+class SendInputBackend(InputBackend):
+    """Windows ``SendInput`` absolute mouse moves via ctypes"""
+    name = 'sendinput'
+    platforms = ('Windows',)
+    MOUSEEVENTF_MOVE = 0x0001
+    MOUSEEVENTF_VIRTUALDESK = 0x4000
+    MOUSEEVENTF_ABSOLUTE = 0x8000
+    # GetSystemMetrics: origin and size of the virtual screen spanning all monitors
+    SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN, SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN = 76, 77, 78, 79
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [('dx', wintypes.LONG), ('dy', wintypes.LONG),
+                        ('mouseData', wintypes.DWORD), ('dwFlags', wintypes.DWORD),
+                        ('time', wintypes.DWORD), ('dwExtraInfo', ctypes.c_void_p)]
+
+        class INPUT(ctypes.Structure):
+            # MOUSEINPUT is the largest member of the INPUT union
+            _fields_ = [('type', wintypes.DWORD), ('mi', MOUSEINPUT)]
+
+        self._user32 = ctypes.windll.user32
+        self._input = INPUT(type=0)
+        self._input_ref = ctypes.byref(self._input)
+        self._input_size = ctypes.sizeof(INPUT)
+        self._point = wintypes.POINT()
+        self._point_ref = ctypes.byref(self._point)
+
+    def position(self):
+        self._user32.GetCursorPos(self._point_ref)
+        return self._point.x, self._point.y
+
+    # The virtual screen spans every monitor; metrics are read on each call
+    # because monitors can be plugged in or rearranged while we run
+    def screen_origin(self):
+        metrics = self._user32.GetSystemMetrics
+        return metrics(self.SM_XVIRTUALSCREEN), metrics(self.SM_YVIRTUALSCREEN)
+
+    def screen_size(self):
+        metrics = self._user32.GetSystemMetrics
+        return metrics(self.SM_CXVIRTUALSCREEN), metrics(self.SM_CYVIRTUALSCREEN)
+
+    def _move_to(self, x, y):
+        left, top = self.screen_origin()
+        width, height = self.screen_size()
+        mi = self._input.mi
+        # With VIRTUALDESK, 0..65535 spans all monitors, so the pointer stays on
+        # a secondary (or negatively offset) monitor instead of jumping to the
+        # primary. Windows maps back with pixel = n * size / 65536 (truncating),
+        # so round up to land on exactly the requested pixel
+        width, height = max(1, width), max(1, height)
+        mi.dx = ((x - left) * 65536 + width - 1) // width
+        mi.dy = ((y - top) * 65536 + height - 1) // height
+        mi.dwFlags = self.MOUSEEVENTF_MOVE | self.MOUSEEVENTF_ABSOLUTE | self.MOUSEEVENTF_VIRTUALDESK
+        self._user32.SendInput(1, self._input_ref, self._input_size)
+
+
+# ---------------------------------------------------------------------------
+# Settings watcher
+# ---------------------------------------------------------------------------
+
+@register_settings_watcher
+class WindowsSettingsWatcher(SettingsWatcher):
+    """ReadDirectoryChangesW on the settings file's directory"""
+    name = 'win32'
+
+    def __init__(self, path, callback, log=None):
+        import ctypes
+        from ctypes import wintypes
+        super().__init__(path, callback, log)
+        k32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        k32.CreateFileW.restype = wintypes.HANDLE
+        k32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                    wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
+        k32.ReadDirectoryChangesW.argtypes = [wintypes.HANDLE, wintypes.LPVOID, wintypes.DWORD, wintypes.BOOL,
+                                              wintypes.DWORD, ctypes.POINTER(wintypes.DWORD),
+                                              wintypes.LPVOID, wintypes.LPVOID]
+        k32.OpenThread.restype = wintypes.HANDLE
+        k32.OpenThread.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        k32.CancelSynchronousIo.argtypes = [wintypes.HANDLE]
+        k32.CloseHandle.argtypes = [wintypes.HANDLE]
+        # FILE_LIST_DIRECTORY, share everything, OPEN_EXISTING, FILE_FLAG_BACKUP_SEMANTICS
+        handle = k32.CreateFileW(os.path.dirname(os.path.abspath(self.path)), 0x0001, 0x7, None, 3, 0x02000000, None)
+        if not handle or handle == wintypes.HANDLE(-1).value:
+            raise SettingsWatcherUnavailable(ctypes.FormatError(ctypes.get_last_error()))
+        self._k32 = k32
+        self._handle = handle
+        self._buffer = ctypes.create_string_buffer(4096)
+        self._returned = wintypes.DWORD()
+        self._returned_ref = ctypes.byref(self._returned)
+
+    def _watch(self):
+        try:
+            while not self._stop.is_set():
+                # FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_LAST_WRITE; any change
+                # in the directory costs only a stat unless it is the settings file
+                if not self._k32.ReadDirectoryChangesW(self._handle, self._buffer, len(self._buffer),
+                                                       False, 0x11, self._returned_ref, None, None):
+                    break  # cancelled by stop()
+                self._check()
+        finally:
+            self._k32.CloseHandle(self._handle)
+
+    def stop(self):
+        super().stop()
+        if self._thread is not None:
+            # THREAD_TERMINATE access is what CancelSynchronousIo needs
+            thread = self._k32.OpenThread(0x0001, False, self._thread.native_id)
+            if thread:
+                self._k32.CancelSynchronousIo(thread)
+                self._k32.CloseHandle(thread)
+
+
+# ---------------------------------------------------------------------------
+# Power
+# ---------------------------------------------------------------------------
+
+def on_battery():
+    """True on battery, False on AC, None if Windows does not know"""
+    import ctypes
+
+    class SYSTEM_POWER_STATUS(ctypes.Structure):
+        _fields_ = [('ACLineStatus', ctypes.c_ubyte), ('BatteryFlag', ctypes.c_ubyte),
+                    ('BatteryLifePercent', ctypes.c_ubyte), ('SystemStatusFlag', ctypes.c_ubyte),
+                    ('BatteryLifeTime', ctypes.c_ulong), ('BatteryFullLifeTime', ctypes.c_ulong)]
+
+    status = SYSTEM_POWER_STATUS()
+    if not ctypes.windll.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+        return None
+    # 0 offline, 1 online, 255 unknown
+    return {0: True, 1: False}.get(status.ACLineStatus)
+
+
+def set_timer_coalescing(enabled, slack):
+    """Opt the process into EcoQoS, which lets Windows coalesce its timers"""
+    import ctypes
+
+    class PROCESS_POWER_THROTTLING_STATE(ctypes.Structure):
+        _fields_ = [('Version', ctypes.c_ulong), ('ControlMask', ctypes.c_ulong),
+                    ('StateMask', ctypes.c_ulong)]
+
+    # PROCESS_POWER_THROTTLING_EXECUTION_SPEED via ProcessPowerThrottling (4)
+    state = PROCESS_POWER_THROTTLING_STATE(1, 1, 1 if enabled else 0)
+    kernel32 = ctypes.windll.kernel32
+    kernel32.GetCurrentProcess.restype = ctypes.c_void_p
+    kernel32.SetProcessInformation.argtypes = [
+        ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p, ctypes.c_ulong]
+    kernel32.SetProcessInformation(kernel32.GetCurrentProcess(), 4,
+                                   ctypes.byref(state), ctypes.sizeof(state))
@@ -1,15 +1,17 @@
 #!/bin/bash
-# Move tool launcher that handles virtual environment automatically
+# Move tool launcher - never installs anything at startup
 
-# Check if virtual environment exists
-if [ ! -d "$HOME/moveit-env" ]; then
-    echo "Creating virtual environment..."
-    python3 -m venv ~/moveit-env
-    source ~/moveit-env/bin/activate
-    pip install pyautogui
-else
+DIR="$(dirname "$0")"
+
+# Prefer the self-contained bundle (python3 build_pyz.py)
+if [ -f "$DIR/dist/move.pyz" ]; then
+    exec python3 "$DIR/dist/move.pyz" simple "$@"
+fi
+
+# Use the virtual environment if one was set up (see README)
+if [ -d "$HOME/moveit-env" ]; then
     source ~/moveit-env/bin/activate
 fi
 
 # Run the tool with all arguments
-python3 "$(dirname "$0")/simple.py" "$@"
+exec python3 "$DIR/simple.py" "$@"
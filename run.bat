@@ -2,4 +2,6 @@
 REM Move Launcher for Windows
 
 echo Move - Starting...
-python move.py %*
+REM -m runs from cached bytecode, so attaching to a running instance stays quick
+set PYTHONPATH=%~dp0;%PYTHONPATH%
+python -m move %*
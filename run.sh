@@ -2,4 +2,6 @@
 # Move Launcher for macOS/Linux
 
 echo "Move - Starting..."
-python3 move.py "$@"
+DIR="$(dirname "$0")"
+# -m runs from cached bytecode, so attaching to a running instance stays quick
+PYTHONPATH="$DIR${PYTHONPATH:+:$PYTHONPATH}" exec python3 -m move "$@"
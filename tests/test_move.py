@@ -0,0 +1,152 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import move  # noqa: E402
+
+
+class NextActionTest(unittest.TestCase):
+    def test_active_waits_for_the_interval(self):
+        # Idle for 5 s, threshold 30 s, but the last move was 10 s ago with a 60 s interval
+        action, deadline = move.next_action(False, 5, 100, 90, 60, 30)
+        self.assertEqual(action, 'active')
+        self.assertEqual(deadline, 150)
+
+    def test_active_without_a_move_waits_for_the_threshold(self):
+        self.assertEqual(move.next_action(False, 5, 100, None, 60, 30), ('active', 125))
+
+
+
+
+class ApplySettingsTest(unittest.TestCase):
+    def test_rejects_unusable_values_and_changes_nothing(self):
+        jiggler = move.Move()
+        for changes in ({'circle_steps': 20.5}, {'circle_steps': 0}, {'circle_radius': float('nan')},
+                        {'cycle_time': 1e9}, {'idle_threshold': 5, 'circle_steps': True}):
+            with self.assertRaises(ValueError):
+                jiggler.apply_settings(changes)
+        self.assertEqual((jiggler.circle_steps, jiggler.idle_threshold), (20, 30))
+        self.assertEqual(jiggler.apply_settings({'circle_steps': 12}), {'circle_steps': 12})
+
+
+class BrokenInputBackend(move.FakeInputBackend):
+    def _move_to(self, x, y):
+        raise OSError("display went away")
+
+
+class KeepAwakeTest(unittest.TestCase):
+    def test_failed_move_is_not_counted(self):
+        saved = move._input_backend
+        self.addCleanup(setattr, move, '_input_backend', saved)
+        move._input_backend = BrokenInputBackend()
+        jiggler = move.Move()
+        jiggler.log.stream = io.StringIO()
+        jiggler.running = True
+        self.assertFalse(jiggler.keep_awake())
+        self.assertFalse(jiggler.running)
+
+class FailingInhibitor(move.FakeInhibitor):
+    name = 'failing'
+
+    def _acquire(self):
+        raise move.InhibitorUnavailable("service not running")
+
+
+class InhibitorGroupTest(unittest.TestCase):
+    def test_failing_member_is_dropped_and_the_rest_stay_held(self):
+        good = move.FakeInhibitor()
+        group = move.InhibitorGroup([good, FailingInhibitor()])
+        group.acquire()
+        self.assertTrue(group.held)
+        self.assertTrue(good.held)
+        self.assertEqual(group.name, 'fake')
+        group.release()
+        self.assertFalse(good.held)
+
+    def test_nothing_is_left_held_when_every_member_fails(self):
+        group = move.InhibitorGroup([FailingInhibitor(), FailingInhibitor()])
+        with self.assertRaises(move.InhibitorUnavailable):
+            group.acquire()
+        self.assertFalse(group.held)
+
+
+class DyingLockMonitor(move.FakeLockMonitor):
+    def _watch(self):
+        raise OSError("bus went away")
+
+
+class LockMonitorTest(unittest.TestCase):
+    def test_dead_watcher_is_replaced_by_polling(self):
+        self.addCleanup(setattr, move, '_lock_monitor', move._lock_monitor)
+        woken = []
+        monitor = DyingLockMonitor(locked=True)
+        monitor.add_listener(woken.append)
+        monitor.start()._thread.join()
+        self.assertTrue(monitor.failed)
+        self.assertEqual(woken, [True])
+        jiggler = move.Move()
+        jiggler.log.stream = io.StringIO()
+        jiggler.lock_monitor = monitor
+        jiggler.replace_lock_monitor()
+        self.addCleanup(jiggler.lock_monitor.stop)
+        self.assertIsInstance(jiggler.lock_monitor, move.PollingLockMonitor)
+        self.assertIs(move.get_lock_monitor(), jiggler.lock_monitor)
+
+
+class SimulationTest(unittest.TestCase):
+    def simulate(self, lines, interval_seconds, jiggler=None):
+        with tempfile.TemporaryDirectory() as tmp:
+            trace = os.path.join(tmp, 'trace.jsonl')
+            with open(trace, 'w') as f:
+                f.write('\n'.join(lines) + '\n')
+            jiggler = jiggler or move.Move()
+            jiggler.log.stream = io.StringIO()
+            return move.run_simulation(trace, jiggler, 0, interval_seconds, out=io.StringIO())
+
+    def test_one_wakeup_per_cycle_while_idle(self):
+        # Our own move resets the idle time; the loop must not wake at the
+        # threshold and again at the interval
+        summary = self.simulate(['{"t": 0, "idle": 100}', '{"t": 3600, "end": true}'], 60)
+        self.assertEqual(summary['moves'], 60)
+        self.assertLessEqual(summary['wakeups'], summary['moves'] + 1)
+
+    def test_held_inhibitor_is_not_counted_as_a_move(self):
+        jiggler = move.Move()
+        jiggler.engine = 'inhibit'
+        summary = self.simulate(['{"t": 0, "idle": 100}', '{"t": 600, "end": true}'], 60, jiggler)
+        self.assertEqual(summary['moves'], 1)
+        self.assertEqual(jiggler.inhibitor.acquired, 1)
+
+
+class CapabilityCacheTest(unittest.TestCase):
+    def test_run_records_the_inhibitor(self):
+        for name in ('capabilities', 'INHIBITOR_ORDER', '_idle_source', '_input_backend', '_lock_monitor'):
+            self.addCleanup(setattr, move, name, getattr(move, name))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'capabilities.json')
+        move.capabilities = move.CapabilityCache(path)
+        move.INHIBITOR_ORDER = {move.SYSTEM: ['fake']}
+        move.set_idle_source(move.FakeIdleSource(100))
+        move.set_input_backend(move.FakeInputBackend())
+        jiggler = move.Move()
+        jiggler.log.stream = io.StringIO()
+        jiggler.scheduler = move.VirtualScheduler(end=120)
+        jiggler.lock_monitor = move.FakeLockMonitor()
+        jiggler.indicator = move.NullIndicator()
+        jiggler.engine = 'inhibit'
+        with contextlib.redirect_stdout(io.StringIO()):
+            jiggler.run(1, 0, False)
+        with open(path) as f:
+            backends = json.load(f)['backends']
+        self.assertEqual(backends['inhibit'], ['fake'])
+
+
+if __name__ == '__main__':
+    unittest.main()